@@ -0,0 +1,110 @@
+import asyncio
+import json
+import aiohttp
+import cache
+import net
+from api import (API_URL, REFERER, PAGE_SIZE, SEARCH_GQL, EPISODES_GQL,
+                 search_variables, parse_shows, episodes_for_mode, episodes_batch_gql, chunks)
+
+PER_HOST = 8       # concurrent connections per host on the shared connector
+
+
+class SingleFlight:
+    """asyncio twin of net.SingleFlight: identical coroutines in flight share one task."""
+
+    def __init__(self):
+        self._calls = {}             # key -> Task
+        self.hits = 0; self.misses = 0
+
+    async def do(self, key, fn, *args):
+        task = self._calls.get(key)
+        if task is None:
+            self.misses += 1
+            task = self._calls[key] = asyncio.ensure_future(fn(*args))
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        else:
+            self.hits += 1
+        return await asyncio.shield(task)      # one caller giving up does not cancel the others
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "in_flight": len(self._calls)}
+
+
+class AsyncAniCliAPI:
+    """Same surface as AniCliAPI, but every call is a coroutine sharing one session."""
+
+    def __init__(self, mode="sub"):
+        self.mode = mode
+        self._session = None
+        self._flight  = SingleFlight()
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=PER_HOST),
+                timeout=aiohttp.ClientTimeout(total=net.TIMEOUT),
+                headers={"User-Agent": net.AGENT})
+        return self._session
+
+    def stats(self) -> dict:
+        return self._flight.stats()
+
+    async def close(self):
+        if self._session is not None: await self._session.close()
+
+    async def _query(self, gql, variables):
+        params = {"variables": json.dumps(variables, sort_keys=True), "query": gql}
+        return await self._flight.do(("q", params["variables"], gql), self._fetch, params)
+
+    async def _fetch(self, params):
+        async with self._get_session().get(API_URL, params=params,
+                                           headers={"Referer": REFERER}) as r:
+            r.raise_for_status()
+            return (await r.json(content_type=None)).get("data") or {}
+
+    async def search_anime(self, query, page=1):
+        key = f"{self.mode}:{page}:{query.strip().lower()}"
+        try:
+            variables = search_variables(query, self.mode, PAGE_SIZE, page)
+            results = parse_shows(await self._query(SEARCH_GQL, variables), self.mode)
+        except Exception as e:
+            print(f"[aio] search error: {e}")
+            hit = cache.get("search", key)
+            return hit[0] if hit else []
+        cache.put("search", key, results)
+        return results
+
+    async def get_episodes(self, show_id):
+        try:
+            detail = ((await self._query(EPISODES_GQL, {"showId": show_id})).get("show") or {}) \
+                         .get("availableEpisodesDetail") or {}
+        except Exception as e:
+            print(f"[aio] episodes error: {e}")
+            hit = cache.get("episodes", show_id)
+            return episodes_for_mode(hit[0], self.mode) if hit else []
+        cache.put("episodes", show_id, detail)
+        return episodes_for_mode(detail, self.mode)
+
+    async def get_episodes_many(self, show_ids):
+        # One aliased query per chunk, chunks in parallel; same isolation rules as AniCliAPI
+        parts = await asyncio.gather(*(self._episodes_chunk(ids) for ids in chunks(show_ids)))
+        return {sid: eps for part in parts for sid, eps in part.items()}
+
+    async def _episodes_chunk(self, ids):
+        try:
+            data = await self._query(episodes_batch_gql(len(ids)),
+                                     {f"id{i}": sid for i, sid in enumerate(ids)})
+        except Exception as e:
+            print(f"[aio] episodes batch error: {e}")
+            eps = await asyncio.gather(*(self.get_episodes(i) for i in ids))
+            return dict(zip(ids, eps))
+        out = {}
+        for i, sid in enumerate(ids):
+            detail = (data.get(f"s{i}") or {}).get("availableEpisodesDetail")
+            if detail is None:
+                hit = cache.get("episodes", sid)
+                out[sid] = episodes_for_mode(hit[0], self.mode) if hit else []
+            else:
+                cache.put("episodes", sid, detail)
+                out[sid] = episodes_for_mode(detail, self.mode)
+        return out
@@ -1,65 +1,170 @@
-import requests
 import json
 import sys
+import net
+import cache
+import tracing
+
+API_URL = "https://api.allanime.day/api"
+REFERER = "https://allmanga.to"
+PAGE_SIZE = 40
+
+SEARCH_GQL = '''query($search:SearchInput $limit:Int $page:Int
+               $translationType:VaildTranslationTypeEnumType
+               $countryOrigin:VaildCountryOriginEnumType){
+    shows(search:$search limit:$limit page:$page
+          translationType:$translationType countryOrigin:$countryOrigin){
+        edges{ _id name availableEpisodes thumbnail type __typename }
+    }
+}'''
+
+EPISODES_GQL = '''query($showId:String!){
+    show(_id:$showId){ _id availableEpisodesDetail }
+}'''
+
+BATCH_SIZE = 25      # show lookups per aliased query (keeps the GET URL well under 8 KB)
+
+
+def episodes_batch_gql(n):
+    """One query with n aliased show lookups: s0:show(_id:$id0){…} s1:…"""
+    args   = " ".join(f"$id{i}:String!" for i in range(n))
+    fields = " ".join(f"s{i}:show(_id:$id{i}){{ _id availableEpisodesDetail }}" for i in range(n))
+    return f"query({args}){{ {fields} }}"
+
+
+def chunks(items, size=BATCH_SIZE):
+    items = list(dict.fromkeys(items))         # drop duplicates, keep order
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+_flight = net.SingleFlight()     # identical queries in flight share one round trip
+
+
+def flight_stats() -> dict:
+    return _flight.stats()
+
+
+def search_variables(query, mode, limit=PAGE_SIZE, page=1):
+    return {
+        "search": {"allowAdult": False, "allowUnknown": False, "query": query},
+        "limit": limit, "page": page,
+        "translationType": mode,
+        "countryOrigin": "ALL"
+    }
+
+
+def parse_shows(data, mode):
+    edges = ((data or {}).get("shows") or {}).get("edges", [])
+    return [
+        {
+            "id":        s["_id"],
+            "title":     s["name"],
+            "episodes":  (s.get("availableEpisodes") or {}).get(mode, 0),
+            "thumbnail": s.get("thumbnail") or "",
+            "type":      s.get("type") or "",
+        }
+        for s in edges if s
+    ]
+
+
+def episodes_for_mode(detail, mode):
+    eps = (detail or {}).get(mode, [])
+    return sorted([e for e in eps if e.replace(".", "", 1).isdigit()], key=float)
 
 
 class AniCliAPI:
     def __init__(self, mode="sub"):
-        self.api_url = "https://api.allanime.day/api"
-        self.referer = "https://allmanga.to"
-        self.agent   = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/121.0"
+        self.api_url = API_URL
+        self.referer = REFERER
+        self.agent   = net.AGENT
         self.mode = mode
 
     def _headers(self):
         return {"Referer": self.referer, "User-Agent": self.agent}
 
-    def search_anime(self, query):
-        gql = '''query($search:SearchInput $limit:Int $page:Int
-                       $translationType:VaildTranslationTypeEnumType
-                       $countryOrigin:VaildCountryOriginEnumType){
-            shows(search:$search limit:$limit page:$page
-                  translationType:$translationType countryOrigin:$countryOrigin){
-                edges{ _id name availableEpisodes thumbnail type __typename }
-            }
-        }'''
-        variables = {
-            "search": {"allowAdult": False, "allowUnknown": False, "query": query},
-            "limit": 40, "page": 1,
-            "translationType": self.mode,
-            "countryOrigin": "ALL"
-        }
-        try:
-            r = requests.get(self.api_url,
-                             params={"variables": json.dumps(variables), "query": gql},
-                             headers=self._headers())
+    def _query(self, gql, variables, op="query"):
+        params = {"variables": json.dumps(variables, sort_keys=True), "query": gql}
+        return _flight.do((self.api_url, params["variables"], gql), self._fetch, params, op)
+
+    def _fetch(self, params, op):
+        with tracing.span(f"api.{op}") as sp:
+            r = net.get(self.api_url, params=params, headers=self._headers())
+            sp.set(status=r.status_code, bytes=len(r.content))
             r.raise_for_status()
-            edges = r.json().get("data", {}).get("shows", {}).get("edges", [])
-            return [
-                {
-                    "id":        s["_id"],
-                    "title":     s["name"],
-                    "episodes":  s.get("availableEpisodes", {}).get(self.mode, 0),
-                    "thumbnail": s.get("thumbnail") or "",
-                    "type":      s.get("type") or "",
-                }
-                for s in edges if s
-            ]
+            return r.json().get("data") or {}
+
+    # ── Search ─────────────────────────────────────────────────────────────
+
+    def _search_key(self, query, page):
+        return f"{self.mode}:{page}:{query.strip().lower()}"
+
+    def cached_search(self, query, page=1):
+        return cache.get("search", self._search_key(query, page))
+
+    def search_page(self, query, page=1):
+        key = self._search_key(query, page)
+        try:
+            variables = search_variables(query, self.mode, PAGE_SIZE, page)
+            results = parse_shows(self._query(SEARCH_GQL, variables, "search"), self.mode)
         except Exception as e:
             print(f"[api] search error: {e}")
-            return []
+            hit = cache.get("search", key)          # serve stale on error
+            return hit[0] if hit else []
+        cache.put("search", key, results)
+        return results
+
+    def search_pages(self, query, max_pages=None):
+        # Yields one list per page as soon as it arrives; stops on a short page
+        page = 1
+        while max_pages is None or page <= max_pages:
+            results = self.search_page(query, page)
+            if results: yield results
+            if len(results) < PAGE_SIZE: return
+            page += 1
+
+    def search_anime(self, query):
+        return self.search_page(query, 1)
+
+    # ── Episodes ───────────────────────────────────────────────────────────
+
+    def _episodes_for_mode(self, detail):
+        return episodes_for_mode(detail, self.mode)
+
+    def cached_episodes(self, show_id):
+        hit = cache.get("episodes", show_id)
+        return (self._episodes_for_mode(hit[0]), hit[1]) if hit else None
 
     def get_episodes(self, show_id):
-        gql = '''query($showId:String!){
-            show(_id:$showId){ _id availableEpisodesDetail }
-        }'''
         try:
-            r = requests.get(self.api_url,
-                             params={"variables": json.dumps({"showId": show_id}), "query": gql},
-                             headers=self._headers())
-            r.raise_for_status()
-            eps = r.json().get("data", {}).get("show", {}) \
-                          .get("availableEpisodesDetail", {}).get(self.mode, [])
-            return sorted([e for e in eps if e.replace(".", "", 1).isdigit()], key=float)
+            detail = (self._query(EPISODES_GQL, {"showId": show_id}, "episodes").get("show") or {}) \
+                         .get("availableEpisodesDetail") or {}
         except Exception as e:
             print(f"[api] episodes error: {e}")
-            return []
+            hit = cache.get("episodes", show_id)
+            return self._episodes_for_mode(hit[0]) if hit else []
+        cache.put("episodes", show_id, detail)
+        return self._episodes_for_mode(detail)
+
+    def get_episodes_many(self, show_ids):
+        """{show_id: episodes} for many shows, BATCH_SIZE per request.
+
+        A show missing from an answer falls back to the cache; a chunk whose
+        request fails is retried one show at a time, so one bad id costs only itself.
+        """
+        out = {}
+        for ids in chunks(show_ids):
+            try:
+                data = self._query(episodes_batch_gql(len(ids)),
+                                   {f"id{i}": sid for i, sid in enumerate(ids)}, "episodes_batch")
+            except Exception as e:
+                print(f"[api] episodes batch error: {e}")
+                for sid in ids: out[sid] = self.get_episodes(sid)
+                continue
+            for i, sid in enumerate(ids):
+                detail = (data.get(f"s{i}") or {}).get("availableEpisodesDetail")
+                if detail is None:
+                    hit = cache.get("episodes", sid)
+                    out[sid] = self._episodes_for_mode(hit[0]) if hit else []
+                else:
+                    cache.put("episodes", sid, detail)
+                    out[sid] = self._episodes_for_mode(detail)
+        return out
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""Headless benchmarks on synthetic data, one JSON line per result.
+
+    python3 bench.py                      # everything, printed to stdout
+    python3 bench.py -k store -n 5        # only names containing "store", 5 runs each
+    python3 bench.py -o bench.jsonl       # append to a file to track regressions
+
+Runs against a throwaway HOME, so the real library is never touched.
+"""
+import argparse
+import atexit
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ["HOME"] = tempfile.mkdtemp(prefix="anisko-bench-")
+atexit.register(shutil.rmtree, os.environ["HOME"], True)      # runs after store's final flush
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PySide6.QtCore import Qt                           # noqa: E402
+from PySide6.QtGui import QImage, QColor, QPixmapCache  # noqa: E402
+from PySide6.QtWidgets import QApplication              # noqa: E402
+
+app = QApplication.instance() or QApplication(sys.argv[:1])
+
+import covers  # noqa: E402
+import main    # noqa: E402
+import player  # noqa: E402
+import store   # noqa: E402
+
+TYPES = ("TV", "MOVIE", "OVA", "ONA", "SPECIAL", "TV_SHORT", "MUSIC")
+_benches = []
+
+
+def bench(name, n):
+    def wrap(fn): _benches.append((name, n, fn)); return fn
+    return wrap
+
+
+def shows(n, prefix="b"):
+    return [{"id": f"{prefix}{i}", "title": f"Synthetic show {i}", "type": TYPES[i % len(TYPES)],
+             "episodes": (i * 7) % 500, "thumbnail": ""} for i in range(n)]
+
+
+def settle():
+    # Deferred deletes + pending paints, so widget work is counted where it happens
+    app.sendPostedEvents(None, 0); app.processEvents()
+
+
+def reset_store():
+    store.flush()
+    with store._lock:
+        store._mem = None
+        store._dirty.update(likes={}, history=False, kv=set(), shows=set())
+    conn = store._db()
+    with conn:
+        for t in ("likes", "history", "shows", "kv"): conn.execute(f"DELETE FROM {t}")
+
+
+# ── Filtering ──────────────────────────────────────────────────────────────
+
+@bench("filter_results", 10_000)
+def _(n):
+    rows = shows(n)
+    def run():
+        for cat in ("series", "films", "extras", "all"): main._filter_results(rows, cat)
+    return None, run
+
+
+# ── Store ──────────────────────────────────────────────────────────────────
+
+@bench("store.add_like", 10_000)
+def _(n):
+    rows = shows(n)
+    def run():
+        for a in rows: store.add_like(a)
+    return reset_store, run
+
+
+@bench("store.get_likes", 10_000)
+def _(n):
+    reset_store()
+    for a in shows(n): store.add_like(a)
+    store.flush()
+    def run():
+        for i in range(0, n, 10): store.is_liked(f"b{i}")
+        store.get_likes()
+    return None, run
+
+
+@bench("store.add_history", 10_000)
+def _(n):
+    rows = shows(n)
+    def run():
+        for i, a in enumerate(rows): store.add_history(a, i % 24 + 1)
+    return reset_store, run
+
+
+@bench("store.flush", 10_000)
+def _(n):
+    rows = shows(n)
+    def setup():
+        reset_store()
+        for a in rows: store.add_like(a); store.add_history(a, 1)
+    return setup, store.flush
+
+
+@bench("store.load", 10_000)
+def _(n):
+    reset_store()
+    for a in shows(n): store.add_like(a); store.add_history(a, 1)
+    store.flush()
+    def setup():
+        with store._lock: store._mem = None
+    return setup, store.get_likes
+
+
+# ── Pages ──────────────────────────────────────────────────────────────────
+
+@bench("SearchPage._render", 2_000)
+def _(n):
+    page = main.SearchPage(main.AniCliAPI()); page.resize(900, 700); page.show()
+    rows = shows(n)
+    def run(): page._render(rows); settle()
+    return None, run
+
+
+@bench("LibraryPage.refresh", 500)
+def _(n):
+    reset_store()
+    for a in shows(n): store.add_like(a)
+    page = main.LibraryPage(); page.resize(900, 700); page.show()
+    def run(): page.refresh(); settle()
+    return None, run
+
+
+@bench("EpisodePage._on_episodes", 2_000)
+def _(n):
+    page = main.EpisodePage(main.AniCliAPI(), player=player.Player()); page.resize(900, 700); page.show()
+    page._anime = {"id": "b0", "title": "Synthetic show 0"}
+    eps = [str(i) for i in range(1, n + 1)]
+    def run(): page._on_episodes(eps); settle()
+    return None, run
+
+
+@bench("MainWindow._apply_theme", 500)
+def _(n):
+    reset_store()
+    for a in shows(n): store.add_like(a)
+    win = main.MainWindow(); win.resize(1020, 720); win.show()
+    for key in ("library", "episode", "profile"): win._nav(key); settle()
+    def run():                                           # every theme, from the profile page
+        for key in main.THEMES: win._apply_theme(key); settle()
+    return None, run
+
+
+# ── Covers ─────────────────────────────────────────────────────────────────
+
+@bench("CoverLabel.paint", 200)
+def _(n):
+    img = QImage(460, 650, QImage.Format_RGB32); img.fill(QColor("#5b3cc4"))
+    ids = [f"c{i}" for i in range(n)]
+    for sid in ids:
+        for w, h in covers.THUMB_SIZES:
+            path = store.get_cover_path(sid, (w, h))
+            img.scaled(w * covers.THUMB_SCALE, h * covers.THUMB_SCALE, Qt.IgnoreAspectRatio) \
+               .save(str(path), "JPG"); covers.disk().added(path)
+    labels = [main.CoverLabel({"id": sid, "thumbnail": ""}) for sid in ids]
+    def setup(): QPixmapCache.clear()                    # cold: decode + round every cover
+    def run():
+        for l, sid in zip(labels, ids): l.reload({"id": sid, "thumbnail": ""}); l.grab()
+    return setup, run
+
+
+# ── Runner ─────────────────────────────────────────────────────────────────
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run_bench(name, n, fn, repeat):
+    setup, run = fn(n)
+    times = []
+    for _ in range(repeat):
+        if setup: setup()
+        t = time.perf_counter(); run(); times.append((time.perf_counter() - t) * 1000)
+    return {"bench": name, "n": n, "runs": repeat,
+            "min_ms": round(min(times), 3), "median_ms": round(statistics.median(times), 3),
+            "mean_ms": round(statistics.fmean(times), 3), "max_ms": round(max(times), 3)}
+
+
+def run_all():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-k", default="", help="only run benchmarks whose name contains this")
+    ap.add_argument("-n", "--repeat", type=int, default=3, help="runs per benchmark (default 3)")
+    ap.add_argument("-o", "--out", help="append results to this file instead of stdout")
+    args = ap.parse_args()
+    meta = {"ts": round(time.time()), "commit": _commit(), "python": platform.python_version(),
+            "platform": sys.platform}
+    out = open(args.out, "a") if args.out else sys.stdout
+    for name, n, fn in _benches:
+        if args.k in name:
+            print(json.dumps({**run_bench(name, n, fn, args.repeat), **meta}), file=out, flush=True)
+    store.flush()
+
+
+if __name__ == "__main__":
+    run_all()
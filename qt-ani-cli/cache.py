@@ -0,0 +1,68 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import store
+
+CACHE_DIR = store.DATA_DIR / "cache"
+MAX_BYTES = 16 * 1024 * 1024
+
+# Seconds an entry is served without asking the network again.
+# Override with the "cache_ttl" setting: {"search": …, "episodes": …}.
+TTL = {"search": 6 * 3600, "episodes": 30 * 60}
+
+_lock = threading.Lock()
+_size = None     # bytes on disk, computed lazily
+
+
+def ttl(kind: str) -> int:
+    return int(store.get_setting("cache_ttl", {}).get(kind, TTL.get(kind, 0)))
+
+
+def _path(kind, key):
+    h = hashlib.sha1(f"{kind}\0{key}".encode()).hexdigest()
+    return CACHE_DIR / f"{kind}-{h}.json"
+
+
+def get(kind: str, key: str):
+    """Return (value, fresh) or None. Stale entries are still returned, flagged fresh=False."""
+    p = _path(kind, key)
+    try:
+        entry = json.loads(p.read_text())
+        os.utime(p)                                  # mtime doubles as LRU clock
+    except Exception:
+        return None
+    return entry["v"], time.time() - entry["t"] < ttl(kind)
+
+
+def put(kind: str, key: str, value):
+    global _size
+    data = json.dumps({"t": time.time(), "v": value}, ensure_ascii=False)
+    p = _path(kind, key); tmp = p.with_suffix(f".{threading.get_ident()}.tmp")
+    with _lock:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        old = p.stat().st_size if p.exists() else 0
+        tmp.write_text(data); os.replace(tmp, p)
+        if _size is None: _size = sum(f.stat().st_size for f in CACHE_DIR.glob("*.json"))
+        else:             _size += p.stat().st_size - old
+        if _size > MAX_BYTES: _evict()
+
+
+def _evict():
+    # Drop least recently used entries down to 3/4 of the budget
+    global _size
+    files = sorted(CACHE_DIR.glob("*.json"), key=lambda f: f.stat().st_mtime)
+    for f in files:
+        if _size <= MAX_BYTES * 3 // 4: break
+        try:
+            n = f.stat().st_size; f.unlink(); _size -= n
+        except OSError:
+            pass
+
+
+def clear():
+    global _size
+    with _lock:
+        for f in CACHE_DIR.glob("*.json"): f.unlink(missing_ok=True)
+        _size = 0
@@ -0,0 +1,351 @@
+import heapq
+import itertools
+import os
+import threading
+import time
+from PySide6.QtCore import Qt, QObject, Signal
+from PySide6.QtGui import QImage
+import net
+import store
+import tracing
+
+# Sizes the UI draws covers at: AnimeCard, ProfileFavoriteCard, EpisodePage hero.
+# Thumbnails are stored at THUMB_SCALE× so they stay sharp on HiDPI screens.
+THUMB_SIZES  = ((46, 64), (60, 84), (90, 126))
+THUMB_SCALE  = 2
+THUMB_QUALITY= 85
+
+WORKERS  = 4
+VISIBLE  = 0       # priorities: lower is served first
+OFFSCREEN= 1
+_RUNNING = -1      # marker in _pending while a download is in flight
+CHUNK    = 16 * 1024   # download granularity: cancellation is checked between chunks
+
+
+class Cancelled(Exception):
+    pass
+
+
+class CoverPool(QObject):
+    """Fixed set of download threads fed by a priority queue, one download per show_id.
+
+    Each request may name an `owner` (any hashable, e.g. id(widget)). A download
+    whose owners have all cancelled is dropped from the queue, or, if already
+    running, aborted at the next chunk. owner=None pins the download.
+    """
+    done = Signal(str, str)          # show_id, cover path
+
+    def __init__(self, workers=WORKERS, parent=None):
+        super().__init__(parent)
+        self._cv      = threading.Condition()
+        self._heap    = []
+        self._seq     = itertools.count()
+        self._pending = {}           # show_id -> _Job
+        self._stats   = {"requested": 0, "deduped": 0, "done": 0, "on_disk": 0, "failed": 0,
+                         "cancelled": 0, "bytes": 0}
+        self._t0      = time.monotonic()
+        for i in range(workers):
+            threading.Thread(target=self._run, name=f"anisko-cover-{i}", daemon=True).start()
+
+    def request(self, show_id, url, priority=OFFSCREEN, owner=None):
+        with self._cv:
+            self._stats["requested"] += 1
+            job = self._pending.get(show_id)
+            if job is not None:
+                self._stats["deduped"] += 1
+                job.owners.add(owner)
+                if job.priority == _RUNNING: job.cancel.clear()     # wanted again
+                elif priority < job.priority: self._push(show_id, priority)
+                return
+            self._pending[show_id] = _Job(url, owner)
+            self._push(show_id, priority)
+
+    def bump(self, show_id):
+        # Called when a card actually gets painted: move it to the front of the line
+        with self._cv:
+            job = self._pending.get(show_id)
+            if job is not None and job.priority > VISIBLE: self._push(show_id, VISIBLE)
+
+    def cancel(self, show_id, owner):
+        with self._cv: self._release(show_id, owner)
+
+    def cancel_owner(self, owner):
+        with self._cv:
+            for show_id in [s for s, j in self._pending.items() if owner in j.owners]:
+                self._release(show_id, owner)
+
+    def _release(self, show_id, owner):
+        # caller holds _cv
+        job = self._pending.get(show_id)
+        if job is None or owner not in job.owners: return
+        job.owners.discard(owner)
+        if job.owners: return
+        if job.priority == _RUNNING: job.cancel.set()
+        else: del self._pending[show_id]; self._stats["cancelled"] += 1   # heap entry goes stale
+
+    def _push(self, show_id, priority):
+        # Older heap entries for the same show are skipped when popped (lazy deletion)
+        self._pending[show_id].priority = priority
+        heapq.heappush(self._heap, (priority, next(self._seq), show_id))
+        self._cv.notify()
+
+    def _next(self):
+        with self._cv:
+            while True:
+                while not self._heap: self._cv.wait()
+                priority, _, show_id = heapq.heappop(self._heap)
+                job = self._pending.get(show_id)
+                if job is None or job.priority != priority: continue     # superseded entry
+                job.priority = _RUNNING
+                return show_id, job
+
+    def _run(self):
+        while True:
+            show_id, job = self._next()
+            path = None; size = 0; cancelled = False; on_disk = False
+            try:
+                if job.url is None:                    # legacy full-size cover on disk
+                    raw = store.get_cover_path(show_id)
+                    path = save_thumbnails(show_id, raw.read_bytes())
+                    if path: disk().remove(raw)
+                elif disk().has(store.get_cover_path(show_id, THUMB_SIZES[-1]), touch=False):
+                    path = store.get_cover_path(show_id, THUMB_SIZES[-1])   # already on disk
+                    on_disk = True
+                else:
+                    data = _download(job.url, job.cancel)
+                    if data: size = len(data); path = save_thumbnails(show_id, data, job.cancel)
+            except Cancelled:
+                cancelled = True
+            except Exception:
+                pass
+            with self._cv:
+                self._pending.pop(show_id, None)
+                if cancelled and job.owners:           # re-requested while aborting: queue again
+                    self._pending[show_id] = job; self._push(show_id, OFFSCREEN); continue
+                if on_disk:     self._stats["on_disk"] += 1             # not a download
+                elif path:      self._stats["done"] += 1; self._stats["bytes"] += size
+                elif cancelled: self._stats["cancelled"] += 1
+                else:           self._stats["failed"] += 1
+            if path: self.done.emit(show_id, str(path))
+
+    def stats(self) -> dict:
+        with self._cv:
+            s = dict(self._stats)
+            running = sum(1 for j in self._pending.values() if j.priority == _RUNNING)
+            s["queued"]  = len(self._pending) - running
+            s["running"] = running
+        elapsed = max(time.monotonic() - self._t0, 1e-6)
+        s["covers_per_s"] = round(s["done"] / elapsed, 2)
+        s["bytes_per_s"]  = round(s["bytes"] / elapsed)
+        return s
+
+
+class _Job:
+    __slots__ = ("url", "priority", "owners", "cancel")
+
+    def __init__(self, url, owner):
+        self.url = url; self.priority = OFFSCREEN
+        self.owners = {owner}; self.cancel = threading.Event()
+
+
+def _download(url, cancel=None):
+    """Body of a 200 response (None otherwise), read CHUNK by CHUNK; raises Cancelled."""
+    with tracing.span("cover.download") as sp, net.get(url, stream=True) as r:
+        sp.set(status=r.status_code)
+        if r.status_code != 200: return None
+        buf = bytearray()
+        try:
+            for chunk in r.iter_content(CHUNK):
+                if cancel is not None and cancel.is_set(): raise Cancelled()
+                buf += chunk
+        finally:
+            net.count_bytes(len(buf))             # streamed: net.get can't count it
+        sp.set(bytes=len(buf))
+    return bytes(buf)
+
+
+def save_thumbnails(show_id, data: bytes, cancel=None):
+    """Decode once, write every THUMB_SIZES variant, return the largest path (None if undecodable).
+
+    Each file is written to a temp name and renamed, so a cover on disk is always whole.
+    """
+    with tracing.span("cover.decode", bytes=len(data)):
+        img = QImage.fromData(data)
+    if img.isNull(): return None
+    with tracing.span("cover.scale"):
+        return _write_thumbnails(show_id, img, cancel)
+
+
+def _write_thumbnails(show_id, img, cancel):
+    path = None
+    for w, h in THUMB_SIZES:
+        if cancel is not None and cancel.is_set(): raise Cancelled()
+        pw, ph = w * THUMB_SCALE, h * THUMB_SCALE
+        sc = img.scaled(pw, ph, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+        sc = sc.copy((sc.width() - pw) // 2, (sc.height() - ph) // 2, pw, ph)
+        path = store.get_cover_path(show_id, (w, h))
+        tmp  = path.with_name(f"{path.name}.{threading.get_ident()}.part")
+        if not sc.save(str(tmp), "JPG", THUMB_QUALITY):
+            tmp.unlink(missing_ok=True); return None
+        os.replace(tmp, path); disk().added(path)
+    return path
+
+
+def best_cover(show_id, w, h, dpr=1.0):
+    """Smallest stored thumbnail covering w×h device pixels, else the largest we have."""
+    need_w, need_h = w * dpr, h * dpr
+    d = disk(); fallback = None
+    for tw, th in THUMB_SIZES:
+        p = store.get_cover_path(show_id, (tw, th))
+        if not d.has(p): continue
+        if tw * THUMB_SCALE >= need_w and th * THUMB_SCALE >= need_h: return d.hit(p)
+        fallback = p
+    if fallback: return d.hit(fallback)
+    raw = store.get_cover_path(show_id)
+    return d.hit(raw) if d.has(raw) else d.miss()
+
+
+# ── Disk cache ─────────────────────────────────────────────────────────────
+#
+# Everything under covers/ is indexed in memory (name -> [last access, bytes])
+# by a background scan at startup, so lookups don't stat the disk. The file
+# mtime is the persistent last-access clock (touched once per session). Over
+# the byte limit (setting "cover_cache_mb"), least recently used files are
+# deleted in the background down to 3/4 of it.
+
+CACHE_MB = 64
+
+
+class CoverCache:
+    def __init__(self):
+        self._lock    = threading.Lock()
+        self._files   = {}           # file name -> [last access, bytes]
+        self._ready   = False
+        self._touched = set()
+        self._bytes   = 0
+        self._evicting= False
+        self._stats   = {"hits": 0, "misses": 0, "corrupt": 0, "evicted": 0}
+        threading.Thread(target=self._scan, name="anisko-cover-scan", daemon=True).start()
+
+    def limit(self) -> int:
+        return int(float(store.get_setting("cover_cache_mb", CACHE_MB)) * 1024 * 1024)
+
+    def _scan(self):
+        found = {}; corrupt = 0
+        d = store.covers_dir()
+        for e in os.scandir(d):
+            try:
+                if e.name.endswith(".part"):                   # left over by a crash
+                    os.unlink(e.path); continue
+                if not e.name.endswith(".jpg"): continue
+                st = e.stat()
+                if st.st_size == 0: os.unlink(e.path); corrupt += 1; continue
+                found[e.name] = [st.st_mtime, st.st_size]
+            except OSError:
+                pass
+        with self._lock:
+            found.update(self._files)                          # written while we scanned
+            self._files = found; self._ready = True
+            self._bytes = sum(v[1] for v in found.values())
+            self._stats["corrupt"] += corrupt
+        self._maybe_evict()
+
+    def has(self, path, touch=True) -> bool:
+        name = path.name
+        with self._lock:
+            e = self._files.get(name)
+            if e is None and not self._ready: return path.exists()
+            if e is None: return False
+            if not touch: return True
+            e[0] = time.time()
+            if name in self._touched: return True
+            self._touched.add(name)
+        try:    os.utime(path)
+        except OSError: pass
+        return True
+
+    def hit(self, path):
+        with self._lock: self._stats["hits"] += 1
+        return path
+
+    def miss(self):
+        with self._lock: self._stats["misses"] += 1
+        return None
+
+    def added(self, path):
+        try:    size = path.stat().st_size
+        except OSError: return
+        with self._lock:
+            old = self._files.get(path.name)
+            self._bytes += size - (old[1] if old else 0)
+            self._files[path.name] = [time.time(), size]; self._touched.add(path.name)
+        self._maybe_evict()
+
+    def remove(self, path):
+        with self._lock:
+            e = self._files.pop(path.name, None)
+            if e: self._bytes -= e[1]
+            self._touched.discard(path.name)
+        path.unlink(missing_ok=True)
+
+    def invalid(self, path):
+        """A file that exists but does not decode: delete it so it gets downloaded again."""
+        if not path.exists(): return
+        with self._lock: self._stats["corrupt"] += 1
+        self.remove(path)
+
+    def _maybe_evict(self):
+        with self._lock:
+            if self._evicting or not self._ready or self._bytes <= self.limit(): return
+            self._evicting = True
+        threading.Thread(target=self._evict, name="anisko-cover-evict", daemon=True).start()
+
+    def _evict(self):
+        d = store.covers_dir()
+        with self._lock:
+            target = self.limit() * 3 // 4; victims = []
+            for name, (_, size) in sorted(self._files.items(), key=lambda kv: kv[1][0]):
+                if self._bytes <= target: break
+                victims.append(name); self._bytes -= size
+                del self._files[name]; self._touched.discard(name)
+            self._stats["evicted"] += len(victims)
+        for name in victims:
+            try:    os.unlink(d / name)
+            except OSError: pass
+        with self._lock: self._evicting = False
+
+    def clear(self):
+        with self._lock:
+            names = list(self._files); self._files = {}; self._bytes = 0; self._touched.clear()
+        d = store.covers_dir()
+        for name in names:
+            try:    os.unlink(d / name)
+            except OSError: pass
+
+    def usage(self) -> dict:
+        with self._lock:
+            s = dict(self._stats)
+            s.update(entries=len(self._files), bytes=self._bytes, limit=self.limit(), ready=self._ready)
+        n = s["hits"] + s["misses"]
+        s["hit_ratio"] = round(s["hits"] / n, 3) if n else 0.0
+        return s
+
+
+_disk = None
+_disk_lock = threading.Lock()
+
+
+def disk() -> CoverCache:
+    global _disk
+    with _disk_lock:
+        if _disk is None: _disk = CoverCache()
+    return _disk
+
+
+_pool = None
+
+
+def pool() -> CoverPool:
+    global _pool
+    if _pool is None: _pool = CoverPool()
+    return _pool
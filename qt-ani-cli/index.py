@@ -0,0 +1,102 @@
+import threading
+import unicodedata
+from collections import defaultdict
+import store
+
+# Local, typo-tolerant title search over every show seen so far (store.shows,
+# plus likes and history). Titles are split into words, each word padded as
+# " word " and cut into trigrams; a query matches on the share of its trigrams
+# a title contains. The query's last word is only padded in front, so a prefix
+# ("fullm") matches as well as a full word.
+
+MIN_SCORE = 0.5      # share of the query's trigrams a title must contain
+LIMIT     = 40
+
+_lock    = threading.Lock()
+_shows   = None      # id -> anime
+_norm    = {}        # id -> normalised title
+_grams   = defaultdict(set)    # trigram -> ids
+
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text or "").lower()
+    return " ".join("".join(c if c.isalnum() else " " for c in text
+                            if not unicodedata.combining(c)).split())
+
+
+def trigrams(text: str, prefix=False) -> set:
+    words = normalize(text).split(); out = set()
+    for i, w in enumerate(words):
+        w = f" {w}" if prefix and i == len(words) - 1 else f" {w} "
+        if len(w) < 3: w = w.ljust(3)
+        out.update(w[j:j + 3] for j in range(len(w) - 2))
+    return out
+
+
+def _add(anime):
+    # caller holds _lock
+    sid = anime["id"]; title = anime.get("title") or ""
+    old = _norm.get(sid)
+    if old is not None and old != normalize(title):
+        for g in trigrams(old): _grams[g].discard(sid)
+    _shows[sid] = anime; _norm[sid] = normalize(title)
+    for g in trigrams(title): _grams[g].add(sid)
+
+
+def _ensure():
+    # caller holds _lock
+    global _shows
+    if _shows is not None: return
+    _shows = {}
+    for a in store.get_shows() + store.get_history() + store.get_likes():
+        if a.get("id"): _add({k: a[k] for k in store.SHOW_FIELDS if k in a})
+
+
+def add(animes):
+    """Index (and persist) shows as they come in: search results and plays.
+
+    Likes and history need no call: they are read once, on first use, and a show
+    can only be liked after it was shown (so already indexed) in this session.
+    """
+    changed = store.remember_shows(animes)
+    with _lock:
+        if _shows is None: return
+        for a in changed: _add(a)
+
+
+def search(query: str, limit=LIMIT, ids=None) -> list:
+    """Best local matches for `query`, best first; `ids` restricts the candidates."""
+    q = normalize(query)
+    if len(q) < 2: return _search_short(q, limit, ids)
+    grams = trigrams(query, prefix=True)
+    if not grams: return []
+    with _lock:
+        _ensure()
+        counts = defaultdict(int)
+        for g in grams:
+            for sid in _grams.get(g, ()):
+                counts[sid] += 1
+        need = max(1, int(len(grams) * MIN_SCORE + 0.999))
+        hits = []
+        for sid, n in counts.items():
+            if n < need or (ids is not None and sid not in ids): continue
+            title = _norm[sid]
+            exact = title.startswith(q) or f" {q}" in title
+            hits.append((-(n / len(grams) + exact), len(title), sid))
+        hits.sort()
+        return [_shows[sid] for _, _, sid in hits[:limit]]
+
+
+def _search_short(q, limit, ids):
+    # One character has no trigram of its own: match titles or words starting with it
+    if not q: return []
+    with _lock:
+        _ensure()
+        hits = sorted((not title.startswith(q), len(title), sid) for sid, title in _norm.items()
+                      if (ids is None or sid in ids) and (title.startswith(q) or f" {q}" in title))
+        return [_shows[sid] for _, _, sid in hits[:limit]]
+
+
+def warm():
+    """Build the in-memory index ahead of the first keystroke (call from a thread)."""
+    with _lock: _ensure()
@@ -1,20 +1,34 @@
 #!/usr/bin/env python3
+import os
 import sys
+import time
+_T0 = time.perf_counter()           # --measure-startup counts from here
 import shutil
-import subprocess
+import functools
+import threading
+import importlib.util
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLineEdit, QLabel, QStackedWidget, QComboBox,
-    QFrame, QSizePolicy, QScrollArea, QGridLayout, QFileDialog
+    QFrame, QScrollArea, QGridLayout, QFileDialog,
+    QListView, QAbstractItemView, QStyledItemDelegate, QStyle
+)
+from PySide6.QtCore import (
+    Qt, QThread, QObject, Signal, QTimer,
+    QAbstractListModel, QModelIndex, QSize, QRect, QRectF, QEvent
 )
-from PySide6.QtCore import Qt, QThread, Signal, QTimer
 from PySide6.QtGui import (
-    QColor, QFont, QPixmap, QPainter, QPainterPath,
-    QLinearGradient, QBrush, QRadialGradient
+    QColor, QFont, QPixmap, QPainter, QPainterPath, QPen,
+    QLinearGradient, QBrush, QRadialGradient, QPixmapCache, QShortcut, QKeySequence, QPalette
 )
-import requests
-from api import AniCliAPI
+import net
+import covers
+import index
+import player
+import tracing
+from api import AniCliAPI, PAGE_SIZE
 import store
+HAS_AIO = importlib.util.find_spec("aiohttp") is not None   # aio is imported on first use
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -70,6 +84,7 @@ THEMES = {
 }
 
 
+@functools.lru_cache(maxsize=None)      # one string per theme, built once
 def make_stylesheet(tk: str) -> str:
     t   = THEMES.get(tk, THEMES["royal_indigo"])
     lm  = t.get("light", False)
@@ -108,7 +123,7 @@ QPushButton#NavBtn {{
     font-size:13px; font-weight:600; text-align:left; padding:11px 16px;
 }}
 QPushButton#NavBtn:hover  {{ background:{pill}; color:{fg}; }}
-QPushButton#NavBtn[active="true"] {{ background:{pill}; color:{sb_active}; border-left:3px solid {a}; }}
+QPushButton#NavBtn:checked {{ background:{pill}; color:{sb_active}; border-left:3px solid {a}; }}
 
 /* ── Inputs ── */
 QLineEdit#Search, QLineEdit#NameInput {{
@@ -131,6 +146,7 @@ QPushButton#GhostBtn {{
     border-radius:10px; color:{fg2}; font-size:12px; padding:8px 18px;
 }}
 QPushButton#GhostBtn:hover {{ border-color:{a}; color:{a}; }}
+QPushButton#GhostBtn:checked {{ border-color:{a}; color:{a}; background:{pill}; }}
 
 QPushButton#IconBtn {{
     background:transparent; border:1.5px solid {border};
@@ -142,7 +158,7 @@ QPushButton#LikeBtn {{
     background:transparent; border:none;
     color:{like_off}; font-size:18px; font-weight:900; padding:4px 6px;
 }}
-QPushButton#LikeBtn[liked="true"] {{ color:{a}; }}
+QPushButton#LikeBtn:checked {{ color:{a}; }}
 
 QPushButton#SaveNameBtn {{
     background:{a}; border:none; border-radius:10px;
@@ -156,7 +172,7 @@ QPushButton#FilterTab {{
     border-radius:20px; color:{fg2}; font-size:11px; font-weight:600; padding:5px 14px;
 }}
 QPushButton#FilterTab:hover {{ border-color:{a}; color:{fg}; }}
-QPushButton#FilterTab[active="true"] {{ background:{pill}; border-color:{a}; color:{a}; font-weight:700; }}
+QPushButton#FilterTab:checked {{ background:{pill}; border-color:{a}; color:{a}; font-weight:700; }}
 
 /* ── Cards ── */
 QFrame#Card {{
@@ -167,14 +183,6 @@ QLabel#CardTitle {{ color:{fg};  font-size:13px; font-weight:600; }}
 QLabel#CardSub   {{ color:{fg2}; font-size:11px; }}
 QFrame#Accent    {{ background:{a}; border-radius:2px; }}
 
-/* ── Episode buttons ── */
-QPushButton#EpBtn {{
-    background:{card}; border:1.5px solid {border};
-    border-radius:8px; color:{fg2}; font-size:11px;
-}}
-QPushButton#EpBtn:hover   {{ border-color:{a}; color:{a}; background:{pill}; }}
-QPushButton#EpBtn:checked {{ background:{a};   border-color:{a}; color:white; font-weight:700; }}
-
 /* ── Badges ── */
 QLabel#EpBadge {{
     background:{a}; color:white; font-size:10px; font-weight:700;
@@ -216,12 +224,12 @@ QLabel#ThemeMode       {{ color:{fg2}; font-size:10px; }}
 QLabel#CheckMark       {{ color:{a};   font-size:14px; font-weight:800; }}
 
 /* ── Combo ── */
-QComboBox#ModeBox {{
+QComboBox#ModeBox, QComboBox#RangeBox {{
     background:{card}; border:1.5px solid {border};
     border-radius:8px; color:{fg2}; font-size:12px; padding:6px 12px;
 }}
-QComboBox#ModeBox::drop-down {{ border:none; }}
-QComboBox#ModeBox QAbstractItemView {{
+QComboBox#ModeBox::drop-down, QComboBox#RangeBox::drop-down {{ border:none; }}
+QComboBox#ModeBox QAbstractItemView, QComboBox#RangeBox QAbstractItemView {{
     background:{card}; color:{fg};
     selection-background-color:{a}; border:1px solid {border};
 }}
@@ -235,10 +243,10 @@ QComboBox#ModeBox QAbstractItemView {{
 class SearchWorker(QThread):
     results_ready = Signal(list)
     error = Signal(str)
-    def __init__(self, api, query):
-        super().__init__(); self.api = api; self.query = query
+    def __init__(self, api, query, page=1):
+        super().__init__(); self.api = api; self.query = query; self.page = page
     def run(self):
-        try: self.results_ready.emit(self.api.search_anime(self.query))
+        try: self.results_ready.emit(self.api.search_page(self.query, self.page))
         except Exception as e: self.error.emit(str(e))
 
 
@@ -252,66 +260,184 @@ class EpisodeWorker(QThread):
         except Exception as e: self.error.emit(str(e))
 
 
-class ImageWorker(QThread):
-    done = Signal(str)
-    def __init__(self, show_id, url):
-        super().__init__(); self.show_id = show_id; self.url = url
-    def run(self):
+class Prefetcher:
+    """Warms the episode cache (and hero covers) for shows the user is likely to open.
+
+    One background thread, newest-first queue, and a budget of `budget` network
+    requests per `window` seconds (setting "prefetch_budget"); over budget, hints are dropped.
+    """
+    def __init__(self, api, budget=None, window=300):
+        self.api = api; self.window = window
+        self.budget = budget or store.get_setting("prefetch_budget", 30)
+        self._cv = threading.Condition(); self._queue = []; self._spent = []
+        self.stats = {"requested": 0, "fetched": 0, "skipped": 0, "over_budget": 0}
+        threading.Thread(target=self._run, name="anisko-prefetch", daemon=True).start()
+
+    def hint(self, anime, urgent=False):
+        if not anime or not anime.get("id"): return
+        if anime.get("thumbnail"):
+            covers.pool().request(anime["id"], anime["thumbnail"], covers.OFFSCREEN)
+        with self._cv:
+            self.stats["requested"] += 1
+            if any(a["id"] == anime["id"] for a in self._queue): return
+            if urgent: self._queue.insert(0, anime)
+            else:      self._queue.append(anime)
+            self._cv.notify()
+
+    def hint_many(self, animes):
+        for a in animes: self.hint(a)
+
+    def _take_budget(self):
+        now = time.monotonic()
+        self._spent = [t for t in self._spent if now - t < self.window]
+        if len(self._spent) >= self.budget: return False
+        self._spent.append(now); return True
+
+    def _run(self):
+        while True:
+            with self._cv:
+                while not self._queue: self._cv.wait()
+                anime = self._queue.pop(0)
+            hit = self.api.cached_episodes(anime["id"])
+            with self._cv:
+                if hit and hit[1]: self.stats["skipped"] += 1; continue
+                if not self._take_budget(): self.stats["over_budget"] += 1; continue
+            self.api.get_episodes(anime["id"])
+            with self._cv: self.stats["fetched"] += 1
+
+
+class AsyncBridge(QObject):
+    """Runs coroutines on one background event loop and calls back on the UI thread."""
+    _done = Signal(int, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        import asyncio
+        self._loop = asyncio.new_event_loop(); self._cbs = {}; self._n = 0
+        self._thread = threading.Thread(target=self._loop.run_forever,
+                                        name="anisko-aio", daemon=True)
+        self._thread.start()
+        self._done.connect(self._dispatch)
+
+    def submit(self, coro, callback=None):
+        self._n += 1; n = self._n
+        if callback: self._cbs[n] = callback
+        import asyncio
+        fut = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        fut.add_done_callback(lambda f, n=n: self._done.emit(
+            n, None if f.cancelled() else (f.exception() or f.result())))
+        return fut
+
+    def _dispatch(self, n, result):
+        cb = self._cbs.pop(n, None)
+        if cb: cb(result)
+
+    def stop(self, cleanup=None):
+        import asyncio
         try:
-            r = requests.get(self.url, timeout=10, headers={"User-Agent": "Mozilla/5.0"})
-            if r.status_code == 200:
-                p = store.get_cover_path(self.show_id)
-                p.write_bytes(r.content)
-                self.done.emit(str(p))
-        except Exception:
-            pass
+            if cleanup: asyncio.run_coroutine_threadsafe(cleanup, self._loop).result(timeout=2)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop); self._thread.join(timeout=2)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 #  CoverLabel
 # ─────────────────────────────────────────────────────────────────────────────
 
+COVER_CACHE_KB = 48 * 1024      # budget for decoded, pre-scaled covers (QPixmapCache)
+
+
+def rounded_cover(show_id, path, w, h, radius, dpr=1.0):
+    """Scaled + rounded cover, built once per (show, size, radius) and kept in QPixmapCache."""
+    key = f"cover:{show_id}:{w}x{h}:{radius}@{dpr:g}"
+    px = QPixmapCache.find(key)
+    if px is not None and not px.isNull(): return px
+    if path is None: return None
+    with tracing.span("cover.round"):
+        return _round_cover(key, path, w, h, radius, dpr)
+
+
+def _round_cover(key, path, w, h, radius, dpr):
+    src = QPixmap(str(path))
+    if src.isNull(): covers.disk().invalid(path); return None      # truncated/corrupt: refetch
+    pw, ph = round(w * dpr), round(h * dpr)
+    sc = src.scaled(pw, ph, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+    out = QPixmap(pw, ph); out.fill(Qt.transparent)
+    p = QPainter(out); p.setRenderHint(QPainter.Antialiasing)
+    clip = QPainterPath(); clip.addRoundedRect(0, 0, pw, ph, radius * dpr, radius * dpr)
+    p.setClipPath(clip)
+    p.drawPixmap(0, 0, sc, max(0, (sc.width() - pw) // 2), max(0, (sc.height() - ph) // 2), pw, ph)
+    p.end()
+    out.setDevicePixelRatio(dpr)
+    QPixmapCache.insert(key, out)
+    return out
+
+
+def cached_cover(show_id, url, w, h, radius, dpr=1.0, priority=covers.OFFSCREEN, owner=None):
+    """Ready-to-draw cover if we have one (memory, then disk); otherwise queue the download.
+
+    `owner` lets the caller cancel the download later (covers.pool().cancel / cancel_owner).
+    """
+    px = rounded_cover(show_id, None, w, h, radius, dpr)
+    if px: return px
+    path = covers.best_cover(show_id, w, h, dpr)
+    if path:
+        if path == store.get_cover_path(show_id):
+            covers.pool().request(show_id, None)            # legacy cover: build thumbnails
+        return rounded_cover(show_id, path, w, h, radius, dpr)
+    if url: covers.pool().request(show_id, url, priority, owner)
+    return None
+
+
 class CoverLabel(QLabel):
     def __init__(self, anime: dict, w=56, h=78, radius=8, parent=None):
         super().__init__(parent)
         self.setFixedSize(w, h)
         self._w = w; self._h = h; self._r = radius
-        self._px = None; self._worker = None
+        self._px = None; self._waiting = None
+        covers.pool().done.connect(self._on_done)
+        # Drop our interest in a pending download once the card is gone
+        self.destroyed.connect(lambda *_, k=id(self): covers.pool().cancel_owner(k))
         self._load(anime)
 
     def _load(self, anime):
         show_id = anime.get("id", "")
         url     = anime.get("thumbnail", "")
+        if self._waiting and self._waiting != show_id:          # re-targeted
+            covers.pool().cancel(self._waiting, id(self))
+        self._waiting = None
         if not show_id: return
-        cache = store.get_cover_path(show_id)
-        if cache.exists(): self._apply(str(cache))
-        elif url:
-            self._worker = ImageWorker(show_id, url)
-            self._worker.done.connect(self._apply)
-            self._worker.start()
+        px = cached_cover(show_id, url, self._w, self._h, self._r, self.devicePixelRatioF(),
+                          covers.VISIBLE if self.isVisible() else covers.OFFSCREEN, id(self))
+        if px: self._px = px; self.update()
+        elif url: self._waiting = show_id
 
     def reload(self, anime):
         self._px = None
-        if self._worker and self._worker.isRunning(): self._worker.terminate()
         self._load(anime); self.update()
 
-    def _apply(self, path):
-        px = QPixmap(path)
-        if not px.isNull(): self._px = px; self.update()
+    def _on_done(self, show_id, path):
+        if show_id == self._waiting:
+            self._waiting = None
+            self._apply(show_id, covers.best_cover(show_id, self._w, self._h,
+                                                   self.devicePixelRatioF()) or path)
+
+    def _apply(self, show_id, path):
+        px = rounded_cover(show_id, path, self._w, self._h, self._r, self.devicePixelRatioF())
+        if px is None: return False
+        self._px = px; self.update(); return True
 
     def paintEvent(self, _):
-        p = QPainter(self); p.setRenderHint(QPainter.Antialiasing)
-        path = QPainterPath(); path.addRoundedRect(0, 0, self._w, self._h, self._r, self._r)
-        p.setClipPath(path)
+        if self._waiting: covers.pool().bump(self._waiting)      # we are on screen
+        p = QPainter(self)
         if self._px:
-            sc = self._px.scaled(self._w, self._h, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
-            x = max(0, (sc.width()  - self._w) // 2)
-            y = max(0, (sc.height() - self._h) // 2)
-            p.drawPixmap(0, 0, sc, x, y, self._w, self._h)
-        else:
-            g = QLinearGradient(0, 0, 0, self._h)
-            g.setColorAt(0, QColor("#1a1a30")); g.setColorAt(1, QColor("#0f0f1c"))
-            p.fillPath(path, QBrush(g))
+            p.drawPixmap(0, 0, self._px)
+            return
+        p.setRenderHint(QPainter.Antialiasing)
+        path = QPainterPath(); path.addRoundedRect(0, 0, self._w, self._h, self._r, self._r)
+        g = QLinearGradient(0, 0, 0, self._h)
+        g.setColorAt(0, QColor("#1a1a30")); g.setColorAt(1, QColor("#0f0f1c"))
+        p.fillPath(path, QBrush(g))
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -400,7 +526,6 @@ class ThemeTile(QFrame):
         self.setObjectName("ThemeTile")
         self.setFixedHeight(60)
         self.setCursor(Qt.PointingHandCursor)
-        self.setProperty("selected", selected)
 
         lay = QHBoxLayout(self); lay.setContentsMargins(14, 0, 14, 0); lay.setSpacing(10)
         dot = QFrame(); dot.setFixedSize(10, 10)
@@ -410,8 +535,13 @@ class ThemeTile(QFrame):
         col.addWidget(QLabel(t["name"], objectName="ThemeName"))
         col.addWidget(QLabel(t["mode"], objectName="ThemeMode"))
         lay.addLayout(col); lay.addStretch()
-        if selected:
-            lay.addWidget(QLabel("✓", objectName="CheckMark", fixedWidth=20))
+        self._check = QLabel("✓", objectName="CheckMark", fixedWidth=20); lay.addWidget(self._check)
+        self.set_selected(selected)
+
+    def set_selected(self, selected: bool):
+        # Repolish this frame alone, not its children
+        self.setProperty("selected", selected); self._check.setVisible(selected)
+        self.style().unpolish(self); self.style().polish(self)
 
     def mousePressEvent(self, ev):
         if ev.button() == Qt.LeftButton: self.clicked.emit(self._key)
@@ -422,14 +552,13 @@ class ThemeTile(QFrame):
 # ─────────────────────────────────────────────────────────────────────────────
 
 def make_like_btn(size=30) -> QPushButton:
-    btn = QPushButton("♥", objectName="LikeBtn")
+    btn = QPushButton("♥", objectName="LikeBtn", checkable=True)
     btn.setFixedSize(size, size); btn.setCursor(Qt.PointingHandCursor)
     return btn
 
 
 def set_liked(btn: QPushButton, liked: bool):
-    btn.setProperty("liked", liked)
-    btn.style().unpolish(btn); btn.style().polish(btn)
+    btn.setChecked(liked)               # styled by :checked, no repolish
 
 
 class Spinner(QLabel):
@@ -488,79 +617,232 @@ def _scroll_area(container: QWidget) -> QScrollArea:
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-#  AnimeCard
+#  ResultsView  – virtualised search results (model + painted delegate)
 # ─────────────────────────────────────────────────────────────────────────────
 
-class AnimeCard(QFrame):
-    clicked      = Signal(dict)
-    like_toggled = Signal(dict, bool)
+class ResultsModel(QAbstractListModel):
+    AnimeRole = Qt.UserRole + 1
 
-    def __init__(self, anime: dict, parent=None):
-        super().__init__(parent)
-        self.anime = anime; self.setObjectName("Card")
-        self.setFixedHeight(82); self.setCursor(Qt.PointingHandCursor)
-        row = QHBoxLayout(self); row.setContentsMargins(10,0,10,0); row.setSpacing(12)
-        row.addWidget(CoverLabel(anime, w=46, h=64, radius=6))
-        col = QVBoxLayout(); col.setSpacing(4)
-        tl = QLabel(anime.get("title","—"), objectName="CardTitle")
-        tl.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred); col.addWidget(tl)
-        mr = QHBoxLayout(); mr.setSpacing(6)
-        mr.addWidget(QLabel(f"{anime.get('episodes',0)} ép.", objectName="CardSub"))
-        kind = _type_label(anime.get("type",""))
-        if kind: mr.addWidget(QLabel(kind, objectName="TypeBadge"))
-        mr.addStretch(); col.addLayout(mr); row.addLayout(col)
-        self._like_btn = make_like_btn(30)
-        set_liked(self._like_btn, store.is_liked(anime["id"]))
-        self._like_btn.clicked.connect(self._on_like); row.addWidget(self._like_btn)
+    def __init__(self, parent=None):
+        super().__init__(parent); self._rows = []; self._row_of = {}
+        covers.pool().done.connect(self._cover_ready)
 
-    def _on_like(self):
-        liked = store.toggle_like(self.anime)
-        set_liked(self._like_btn, liked)
-        self.like_toggled.emit(self.anime, liked)
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
 
-    def mousePressEvent(self, ev):
-        if ev.button() == Qt.LeftButton: self.clicked.emit(self.anime)
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid(): return None
+        a = self._rows[index.row()]
+        if role == self.AnimeRole:   return a
+        if role == Qt.DisplayRole:   return a.get("title", "")
+        if role == Qt.ToolTipRole:   return a.get("title", "")
+        return None
 
+    def set_results(self, rows):
+        covers.pool().cancel_owner(id(self))                 # old rows: nobody will see them
+        self.beginResetModel(); self._rows = list(rows); self._reindex(); self.endResetModel()
+        self._prefetch(self._rows)
 
-# ─────────────────────────────────────────────────────────────────────────────
-#  ProfileFavoriteCard
-# ─────────────────────────────────────────────────────────────────────────────
+    def append(self, rows):
+        if not rows: return
+        n = len(self._rows)
+        self.beginInsertRows(QModelIndex(), n, n + len(rows) - 1)
+        self._rows.extend(rows); self._reindex(n)
+        self.endInsertRows(); self._prefetch(rows)
+
+    def _reindex(self, start=0):
+        if start == 0: self._row_of = {}
+        for i in range(start, len(self._rows)):
+            self._row_of.setdefault(self._rows[i]["id"], []).append(i)
+
+    def _prefetch(self, rows):
+        # Queue missing covers at low priority; rows that get painted are bumped by the delegate
+        d, big = covers.disk(), covers.THUMB_SIZES[-1]
+        for a in rows:
+            if a.get("thumbnail") and not d.has(store.get_cover_path(a["id"], big), touch=False):
+                covers.pool().request(a["id"], a["thumbnail"], covers.OFFSCREEN, id(self))
+
+    def refresh_show(self, show_id):
+        for i in self._row_of.get(show_id, []):
+            ix = self.index(i); self.dataChanged.emit(ix, ix)
 
-class ProfileFavoriteCard(QFrame):
-    clicked      = Signal(dict)
-    like_toggled = Signal()
+    def _cover_ready(self, show_id, _path):
+        self.refresh_show(show_id)
 
-    def __init__(self, anime: dict, parent=None):
+
+class AnimeDelegate(QStyledItemDelegate):
+    H = 82; GAP = 6; CW = 46; CH = 64; CR = 6; LIKE = 30
+
+    def __init__(self, parent=None):
+        super().__init__(parent); self.set_theme(store.get_theme())
+
+    def set_theme(self, key):
+        t = THEMES.get(key, THEMES["royal_indigo"]); lm = t.get("light", False)
+        self._c = {k: QColor(t[k]) for k in ("a", "card", "border", "pill", "fg", "fg2")}
+        self._c["like_off"] = QColor(t["fg2"] if lm else "#2a2a44")
+        self._title_f = QFont("Inter"); self._title_f.setPixelSize(13); self._title_f.setWeight(QFont.DemiBold)
+        self._sub_f   = QFont("Inter"); self._sub_f.setPixelSize(11)
+        self._badge_f = QFont("Inter"); self._badge_f.setPixelSize(9); self._badge_f.setBold(True)
+        self._badge_f.setLetterSpacing(QFont.AbsoluteSpacing, 1)
+        self._like_f  = QFont("Inter"); self._like_f.setPixelSize(18); self._like_f.setWeight(QFont.Black)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.H + self.GAP)
+
+    def card_rect(self, rect):
+        return rect.adjusted(0, 0, -1, -self.GAP - 1)
+
+    def like_rect(self, rect):
+        c = self.card_rect(rect)
+        return QRect(c.right() - 10 - self.LIKE, c.center().y() - self.LIKE // 2, self.LIKE, self.LIKE)
+
+    def paint(self, p, option, index):
+        a = index.data(ResultsModel.AnimeRole)
+        if a is None: return
+        p.save(); p.setRenderHint(QPainter.Antialiasing)
+        card = self._card(p, option)
+        cx, cy = card.x() + 10, card.center().y() - self.CH // 2
+        self._cover(p, a, cx, cy, index)
+        # Title + meta line
+        like = self.like_rect(option.rect)
+        tx = cx + self.CW + 12; tw = like.left() - 12 - tx
+        p.setFont(self._title_f); p.setPen(self._c["fg"])
+        title = p.fontMetrics().elidedText(a.get("title", "—"), Qt.ElideRight, tw)
+        p.drawText(QRect(tx, card.center().y() - 22, tw, 20), Qt.AlignLeft | Qt.AlignBottom, title)
+        p.setFont(self._sub_f); p.setPen(self._c["fg2"])
+        sub = f"{a.get('episodes', 0)} ép."
+        sw = p.fontMetrics().horizontalAdvance(sub)
+        p.drawText(QRect(tx, card.center().y() + 2, sw, 18), Qt.AlignLeft | Qt.AlignVCenter, sub)
+        self._type_badge(p, a, tx + sw + 6, card.center().y() + 4)
+        self._heart(p, a, like)
+        p.restore()
+
+    def _card(self, p, option):
+        card  = self.card_rect(option.rect)
+        hover = bool(option.state & QStyle.State_MouseOver)
+        p.setPen(QPen(self._c["a"] if hover else self._c["border"], 1))
+        p.setBrush(self._c["pill"] if hover else self._c["card"])
+        p.drawRoundedRect(QRectF(card).adjusted(0.5, 0.5, -0.5, -0.5), 12, 12)
+        return card
+
+    def _cover(self, p, a, cx, cy, index):
+        px = cached_cover(a["id"], a.get("thumbnail", ""), self.CW, self.CH, self.CR,
+                          p.device().devicePixelRatioF(), covers.VISIBLE, id(index.model()))
+        if px:
+            covers.pool().bump(a["id"])
+            p.drawPixmap(cx, cy, px)
+        else:
+            g = QLinearGradient(0, cy, 0, cy + self.CH)
+            g.setColorAt(0, QColor("#1a1a30")); g.setColorAt(1, QColor("#0f0f1c"))
+            p.setPen(Qt.NoPen); p.setBrush(QBrush(g))
+            p.drawRoundedRect(cx, cy, self.CW, self.CH, self.CR, self.CR)
+
+    def _type_badge(self, p, a, x, y):
+        kind = _type_label(a.get("type", ""))
+        if not kind: return
+        p.setFont(self._badge_f)
+        br = QRect(x, y, p.fontMetrics().horizontalAdvance(kind) + 12, 14)
+        p.setPen(Qt.NoPen); p.setBrush(self._c["border"]); p.drawRoundedRect(br, 4, 4)
+        p.setPen(self._c["fg2"]); p.drawText(br, Qt.AlignCenter, kind)
+
+    def _heart(self, p, a, rect):
+        p.setFont(self._like_f)
+        p.setPen(self._c["a"] if store.is_liked(a["id"]) else self._c["like_off"])
+        p.drawText(rect, Qt.AlignCenter, "♥")
+
+
+class FavoriteDelegate(AnimeDelegate):
+    """ProfilePage favourites: two cards per row, bigger cover, episode badge, heart below."""
+    H = 108; GAP = 10; CW = 60; CH = 84; CR = 8; LIKE = 26
+
+    def set_theme(self, key):
+        super().set_theme(key)
+        self._ep_f = QFont("Inter"); self._ep_f.setPixelSize(10); self._ep_f.setBold(True)
+
+    def sizeHint(self, option, index):
+        return QSize((self.parent().viewport().width() - 1) // 2, self.H + self.GAP)
+
+    def card_rect(self, rect):
+        # Left column keeps GAP/2 on its right, right column on its left
+        half = self.GAP // 2
+        return rect.adjusted(half if rect.x() > 0 else 0, 0, -1 if rect.x() > 0 else -half - 1, -self.GAP - 1)
+
+    def like_rect(self, rect):
+        c = self.card_rect(rect)
+        return QRect(c.x() + 12 + self.CW + 6, c.bottom() - 8 - self.LIKE, self.LIKE, self.LIKE)
+
+    def paint(self, p, option, index):
+        a = index.data(ResultsModel.AnimeRole)
+        if a is None: return
+        p.save(); p.setRenderHint(QPainter.Antialiasing)
+        card = self._card(p, option)
+        cx, cy = card.x() + 12, card.y() + 12
+        self._cover(p, a, cx, cy, index)
+        tx = cx + self.CW + 12; tw = card.right() - 12 - tx
+        p.setFont(self._sub_f); p.setPen(self._c["fg2"])
+        p.drawText(QRect(tx, cy, 10, 20), Qt.AlignLeft | Qt.AlignVCenter, "•")
+        p.setFont(self._title_f); p.setPen(self._c["fg"])
+        title = p.fontMetrics().elidedText(a.get("title", "—"), Qt.ElideRight, tw - 14)
+        p.drawText(QRect(tx + 14, cy, tw - 14, 20), Qt.AlignLeft | Qt.AlignVCenter, title)
+        p.setFont(self._ep_f)
+        ep = f"{a.get('episodes', 0)} EP"
+        er = QRect(tx, cy + 26, p.fontMetrics().horizontalAdvance(ep) + 16, 17)
+        p.setPen(Qt.NoPen); p.setBrush(self._c["a"]); p.drawRoundedRect(er, 6, 6)
+        p.setPen(QColor("white")); p.drawText(er, Qt.AlignCenter, ep)
+        self._type_badge(p, a, er.right() + 7, er.y() + 2)
+        self._heart(p, a, self.like_rect(option.rect))
+        p.restore()
+
+
+class ResultsView(QListView):
+    anime_clicked = Signal(dict)
+    anime_hovered = Signal(dict)
+    like_toggled  = Signal(dict, bool)
+    Delegate = AnimeDelegate
+
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.anime = anime; self.setObjectName("Card")
-        self.setFixedHeight(108); self.setCursor(Qt.PointingHandCursor)
-        row = QHBoxLayout(self); row.setContentsMargins(12,12,12,12); row.setSpacing(12)
-        row.addWidget(CoverLabel(anime, w=60, h=84, radius=8))
-        col = QVBoxLayout(); col.setSpacing(4)
-        tr = QHBoxLayout(); tr.setSpacing(4)
-        tr.addWidget(QLabel("•", objectName="SubLbl"))
-        tl = QLabel(anime.get("title","—"), objectName="CardTitle"); tr.addWidget(tl, 1)
-        col.addLayout(tr)
-        br = QHBoxLayout(); br.setSpacing(6)
-        eb = QLabel(f"{anime.get('episodes',0)} EP", objectName="EpBadge"); eb.setFixedHeight(17)
-        br.addWidget(eb)
-        kind = _type_label(anime.get("type",""))
-        if kind: br.addWidget(QLabel(kind, objectName="TypeBadge"))
-        br.addStretch(); col.addLayout(br); col.addStretch()
-        lr = QHBoxLayout()
-        self._like_btn = make_like_btn(26)
-        set_liked(self._like_btn, store.is_liked(anime["id"]))
-        self._like_btn.clicked.connect(self._on_like)
-        lr.addWidget(self._like_btn); lr.addStretch(); col.addLayout(lr)
-        row.addLayout(col)
+        self._model = ResultsModel(self); self._delegate = self.Delegate(self)
+        self.setModel(self._model); self.setItemDelegate(self._delegate)
+        self.setUniformItemSizes(True); self.setMouseTracking(True)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.verticalScrollBar().setSingleStep(24)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setFrameShape(QFrame.NoFrame); self.viewport().setAutoFillBackground(False)
+        self.setCursor(Qt.PointingHandCursor); self.setFocusPolicy(Qt.NoFocus)
+        self.entered.connect(lambda ix: self.anime_hovered.emit(ix.data(ResultsModel.AnimeRole)))
+
+    def model(self) -> ResultsModel: return self._model
+    def set_theme(self, key): self._delegate.set_theme(key); self.viewport().update()
+
+    def mouseReleaseEvent(self, ev):
+        ix = self.indexAt(ev.position().toPoint())
+        if ev.button() != Qt.LeftButton or not ix.isValid(): return super().mouseReleaseEvent(ev)
+        a = ix.data(ResultsModel.AnimeRole)
+        if self._delegate.like_rect(self.visualRect(ix)).contains(ev.position().toPoint()):
+            liked = store.toggle_like(a)
+            self._model.refresh_show(a["id"]); self.like_toggled.emit(a, liked)
+        else:
+            self.anime_clicked.emit(a)
 
-    def _on_like(self):
-        store.toggle_like(self.anime)
-        set_liked(self._like_btn, store.is_liked(self.anime["id"]))
-        self.like_toggled.emit()
 
-    def mousePressEvent(self, ev):
-        if ev.button() == Qt.LeftButton: self.clicked.emit(self.anime)
+class FavoritesView(ResultsView):
+    """Two-column, non-scrolling ResultsView: sized to its rows, scrolled by the page around it."""
+
+    Delegate = FavoriteDelegate
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFlow(QListView.LeftToRight); self.setWrapping(True); self.setResizeMode(QListView.Adjust)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self._model.modelReset.connect(self._fit)
+
+    def _fit(self):
+        rows = (self._model.rowCount() + 1) // 2
+        self.setFixedHeight(rows * (FavoriteDelegate.H + FavoriteDelegate.GAP))
+
+    def wheelEvent(self, ev): ev.ignore()            # let the page scroll
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -569,11 +851,20 @@ class ProfileFavoriteCard(QFrame):
 
 class SearchPage(QWidget):
     anime_selected = Signal(dict)
+    anime_hovered  = Signal(dict)
+    top_results    = Signal(list)    # first rows of a new result set, for prefetching
+    PREFETCH_TOP   = 3
     FILTERS = [("all","Tout"),("series","Séries"),("films","Films"),("extras","Extras")]
+    DEBOUNCE_MS = 350      # pause in typing before a search fires
+    MIN_CHARS   = 2        # shortest query searched while typing (Enter always searches)
+    BLIND_PAGES = 3        # pages fetched in a row on our own when the filter shows none of them
 
     def __init__(self, api):
         super().__init__(); self.api = api
-        self._worker = None; self._all = []; self._active = "series"
+        self._worker = None; self._more_worker = None; self._all = []; self._active = "series"
+        self._query = ""; self._page = 1; self._more = False; self._loading = False
+        self._blind = 0; self._rendering = False
+        self._gen = 0; self._queued = None
         self._filter_btns = {}; self._build()
 
     def _build(self):
@@ -583,14 +874,18 @@ class SearchPage(QWidget):
         row = QHBoxLayout(); row.setSpacing(10)
         self._input = QLineEdit(objectName="Search", placeholderText="Titre de l'animé…")
         self._input.returnPressed.connect(self._search); row.addWidget(self._input)
+        self._debounce = QTimer(self); self._debounce.setSingleShot(True)
+        self._debounce.setInterval(self.DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._typed_search)
+        self._input.textEdited.connect(lambda _: self._debounce.start())
         btn = QPushButton("Rechercher", objectName="PrimaryBtn")
         btn.setFixedHeight(44); btn.clicked.connect(self._search); row.addWidget(btn)
         root.addLayout(row)
         # Filter tabs
         tab_row = QHBoxLayout(); tab_row.setSpacing(8); tab_row.setAlignment(Qt.AlignLeft)
         for key, label in self.FILTERS:
-            b = QPushButton(label, objectName="FilterTab")
-            b.setProperty("active", key == "series")
+            b = QPushButton(label, objectName="FilterTab", checkable=True)
+            b.setChecked(key == "series")
             b.clicked.connect(lambda _, k=key: self._apply_filter(k))
             self._filter_btns[key] = b; tab_row.addWidget(b)
         tab_row.addStretch()
@@ -599,72 +894,227 @@ class SearchPage(QWidget):
         self._spin = Spinner("Recherche en cours"); self._spin.hide(); root.addWidget(self._spin)
         self._hint = QLabel("Tape le nom d'un animé pour commencer",
                             objectName="Hint", alignment=Qt.AlignCenter); root.addWidget(self._hint)
-        self._cont = QWidget()
-        self._vbox = QVBoxLayout(self._cont); self._vbox.setContentsMargins(0,0,0,16)
-        self._vbox.setSpacing(6); self._vbox.addStretch()
-        self._scroll = _scroll_area(self._cont); self._scroll.hide(); root.addWidget(self._scroll)
+        self._empty = QLabel("Aucun résultat dans cette catégorie.",
+                             objectName="Hint", alignment=Qt.AlignCenter)
+        self._empty.hide(); root.addWidget(self._empty)
+        self._scroll = ResultsView(); self._scroll.hide(); root.addWidget(self._scroll, 1)
+        self._scroll.anime_clicked.connect(self.anime_selected)
+        self._scroll.anime_hovered.connect(self.anime_hovered)
+        # Infinite scroll: fetch the next page when we get close to the bottom
+        bar = self._scroll.verticalScrollBar()
+        bar.valueChanged.connect(self._maybe_more); bar.rangeChanged.connect(self._maybe_more)
+        self._more_spin = Spinner("Chargement de la suite"); self._more_spin.hide()
+        root.addWidget(self._more_spin)
+
+    def _typed_search(self):
+        q = self._input.text().strip()
+        if len(q) >= self.MIN_CHARS and q != self._query: self._search()
 
     def _search(self):
+        self._debounce.stop()
         q = self._input.text().strip()
-        if not q or (self._worker and self._worker.isRunning()): return
-        self._clear(); self._scroll.hide(); self._tabs_w.hide()
-        self._hint.hide(); self._spin.start()
+        if not q: return
+        self._gen += 1                              # responses for older queries are dropped
+        self._clear(); self._scroll.hide(); self._tabs_w.hide(); self._more_spin.stop()
+        self._hint.hide(); self._active = "series"
+        self._query = q; self._page = 1; self._more = False; self._loading = False
+        self._all = []
+        hit = self.api.cached_search(q)
+        if hit:
+            self._on_results(hit[0])
+            if hit[1]: self._queued = None; return  # fresh: no need to ask the API
+        else:
+            self._spin.start()
+            local = index.search(q)                 # shows seen before, while the API answers
+            if local: self._on_local(local)
+        self._fetch(q, self._gen, bool(hit))
+
+    def _fetch(self, q, gen, refresh):
+        # At most one search request in flight; only the latest waiting query is kept
+        if self._worker and self._worker.isRunning():
+            self._queued = (q, gen, refresh); return
         self._worker = SearchWorker(self.api, q)
-        self._worker.results_ready.connect(self._on_results)
-        self._worker.error.connect(self._on_error); self._worker.start()
+        self._worker.results_ready.connect(
+            lambda res, g=gen, r=refresh: self._on_fetched(g, res, r))
+        self._worker.error.connect(lambda msg, g=gen: g == self._gen and self._on_error(msg))
+        self._worker.finished.connect(self._fetch_queued)
+        self._worker.start()
+
+    def _fetch_queued(self):
+        queued, self._queued = self._queued, None
+        if queued and queued[1] == self._gen: self._fetch(*queued)
+
+    def _on_fetched(self, gen, results, refresh):
+        if gen != self._gen: return                 # superseded by a newer query
+        (self._on_refresh if refresh else self._on_results)(results)
+
+    def _on_local(self, results):
+        self._all = list(results); self._hint.hide(); self._tabs_w.show()
+        self._render(_filter_results(results, self._active)); self._update_tabs(self._active)
 
     def _on_results(self, results):
-        self._spin.stop(); self._all = results; self._active = "series"
-        if not results: self._hint.setText("Aucun résultat."); self._hint.show(); return
-        self._tabs_w.show(); self._render(_filter_results(results, "series")); self._update_tabs("series")
+        self._spin.stop(); self._all = list(results); self._page = 1
+        self._more = len(results) >= PAGE_SIZE
+        index.add(results)
+        if not results:
+            self._clear(); self._scroll.hide(); self._tabs_w.hide()
+            self._hint.setText("Aucun résultat."); self._hint.show(); return
+        self._hint.hide(); self._tabs_w.show()
+        shown = _filter_results(results, self._active)
+        self._render(shown); self._update_tabs(self._active)
+        self.top_results.emit(shown[:self.PREFETCH_TOP])
+
+    def _on_refresh(self, results):
+        # Only replace what is on screen while the user hasn't scrolled past page 1
+        if results and self._page == 1 and results != self._all: self._on_results(results)
+
+    # ── Pagination ──────────────────────────────────────────────────────────
+
+    def _maybe_more(self, *_):
+        # Driven by the scroll bar, and re-checked after each page: a filter showing
+        # nothing (hidden view, no scroll bar) keeps fetching, up to BLIND_PAGES in a row
+        if not self._more or self._loading or self._rendering or not self._all: return
+        if self._more_worker and self._more_worker.isRunning(): return
+        if self._scroll.isHidden():                         # own state, unlike isVisible(): not set by switching pages
+            if self._blind >= self.BLIND_PAGES: return
+        else:
+            self._rendering = True                          # the layout re-emits rangeChanged
+            try:     self._scroll.executeDelayedItemsLayout()   # scroll range up to date with the rows
+            finally: self._rendering = False
+            bar = self._scroll.verticalScrollBar()
+            if bar.maximum() - bar.value() > 2 * self._scroll.viewport().height(): return
+        page = self._page + 1
+        hit = self.api.cached_search(self._query, page)
+        if hit and hit[1]: self._on_page(self._query, page, hit[0]); return
+        self._loading = True; self._more_spin.start()
+        self._more_worker = SearchWorker(self.api, self._query, page)
+        self._more_worker.results_ready.connect(
+            lambda res, q=self._query, p=page: self._on_page(q, p, res))
+        self._more_worker.start()
+
+    def _on_page(self, query, page, results):
+        if query != self._query or page != self._page + 1: return   # stale page
+        self._loading = False; self._more_spin.stop()
+        self._page = page; self._more = len(results) >= PAGE_SIZE
+        self._all.extend(results); index.add(results)
+        shown = _filter_results(results, self._active); self._append(shown)
+        self._blind = 0 if shown else self._blind + 1
+        if self._blind < self.BLIND_PAGES: self._maybe_more()
 
     def _apply_filter(self, key):
         self._active = key
         self._render(_filter_results(self._all, key)); self._update_tabs(key)
 
     def _update_tabs(self, active):
-        for k, btn in self._filter_btns.items():
-            btn.setProperty("active", k == active)
-            btn.style().unpolish(btn); btn.style().polish(btn)
+        for k, btn in self._filter_btns.items(): btn.setChecked(k == active)
 
+    @tracing.timed("page.search.render")
     def _render(self, results):
-        while self._vbox.count():
-            it = self._vbox.takeAt(0)
-            if it.widget(): it.widget().deleteLater()
-        self._vbox.addStretch()
-        if not results:
-            self._vbox.insertWidget(0, QLabel("Aucun résultat dans cette catégorie.",
-                                    objectName="Hint", alignment=Qt.AlignCenter))
-            self._scroll.show(); return
-        self._scroll.show()
-        for i, a in enumerate(results):
-            card = AnimeCard(a)
-            card.clicked.connect(self.anime_selected)
-            self._vbox.insertWidget(i, card)
+        # The scroll bar fires mid-reset with a half-updated view: check once, at the end
+        self._blind = 0; self._rendering = True
+        try:
+            self._scroll.model().set_results(results)
+            self._scroll.setVisible(bool(results)); self._empty.setVisible(not results)
+            self._scroll.scrollToTop()
+        finally:
+            self._rendering = False
+        self._maybe_more()
+
+    def _append(self, results):
+        if not results: return
+        self._scroll.model().append(results)
+        self._scroll.show(); self._empty.hide()
+
+    def set_theme(self, key): self._scroll.set_theme(key)
 
     def _on_error(self, msg):
         self._spin.stop(); self._hint.setText(f"Erreur : {msg}"); self._hint.show()
 
     def _clear(self):
-        while self._vbox.count():
-            it = self._vbox.takeAt(0)
-            if it.widget(): it.widget().deleteLater()
-        self._vbox.addStretch()
+        self._scroll.model().set_results([]); self._empty.hide()
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 #  EpisodePage
 # ─────────────────────────────────────────────────────────────────────────────
 
+class EpisodeModel(QAbstractListModel):
+    """One range (e.g. 101–200) of a show's episodes; selection is tracked here, O(1)."""
+    SelectedRole = Qt.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent); self._eps = []; self._lo = 0; self._hi = 0; self.selected = None
+        self._pos = {}
+
+    def set_episodes(self, eps):
+        self.beginResetModel()
+        self._eps = eps; self._pos = {e: i for i, e in enumerate(eps)}; self._lo = self._hi = 0
+        self.endResetModel()
+
+    def set_range(self, lo, hi):
+        self.beginResetModel(); self._lo, self._hi = lo, min(hi, len(self._eps)); self.endResetModel()
+
+    def range_of(self, ep):
+        return self._pos.get(ep)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._hi - self._lo
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid(): return None
+        ep = self._eps[self._lo + index.row()]
+        if role == Qt.DisplayRole:     return ep
+        if role == self.SelectedRole:  return ep == self.selected
+        return None
+
+    def select(self, ep):
+        old, self.selected = self.selected, ep
+        for e in (old, ep):
+            i = self._pos.get(e)
+            if i is not None and self._lo <= i < self._hi:
+                ix = self.index(i - self._lo); self.dataChanged.emit(ix, ix)
+
+
+class EpisodeDelegate(QStyledItemDelegate):
+    W = 66; H = 36; GAP = 6
+
+    def __init__(self, parent=None):
+        super().__init__(parent); self.set_theme(store.get_theme())
+
+    def set_theme(self, key):
+        t = THEMES.get(key, THEMES["royal_indigo"])
+        self._c = {k: QColor(t[k]) for k in ("a", "card", "border", "pill", "fg2")}
+        self._f = QFont("Inter"); self._f.setPixelSize(11)
+        self._fb = QFont(self._f); self._fb.setBold(True)
+
+    def sizeHint(self, option, index):
+        return QSize(self.W + self.GAP, self.H + self.GAP)
+
+    def paint(self, p, option, index):
+        r = QRectF(option.rect.x(), option.rect.y(), self.W, self.H).adjusted(0.75, 0.75, -0.75, -0.75)
+        sel   = index.data(EpisodeModel.SelectedRole)
+        hover = bool(option.state & QStyle.State_MouseOver)
+        p.save(); p.setRenderHint(QPainter.Antialiasing)
+        if sel:     p.setPen(QPen(self._c["a"], 1.5));      p.setBrush(self._c["a"])
+        elif hover: p.setPen(QPen(self._c["a"], 1.5));      p.setBrush(self._c["pill"])
+        else:       p.setPen(QPen(self._c["border"], 1.5)); p.setBrush(self._c["card"])
+        p.drawRoundedRect(r, 8, 8)
+        p.setFont(self._fb if sel else self._f)
+        p.setPen(QColor("white") if sel else self._c["a"] if hover else self._c["fg2"])
+        p.drawText(r, Qt.AlignCenter, index.data())
+        p.restore()
+
+
 class EpisodePage(QWidget):
     back   = Signal()
-    played = Signal(dict, str)
+    RANGE  = 100
 
-    def __init__(self, api, get_mode=None):
-        super().__init__(); self.api = api
+    def __init__(self, api, player, get_mode=None):
+        super().__init__(); self.api = api; self._player = player
         self._get_mode = get_mode or (lambda: "sub")
-        self._worker = None; self._anime = None; self._ep = None; self._ep_btns = []
-        self._build()
+        self._workers = set(); self._anime = None; self._ep = None
+        self._eps = []; self._build()
+        player.started.connect(self._on_started); player.error.connect(self._on_play_error)
 
     def _build(self):
         root = QVBoxLayout(self); root.setContentsMargins(36,28,36,20); root.setSpacing(12)
@@ -682,77 +1132,120 @@ class EpisodePage(QWidget):
         self._title_lbl = QLabel("", objectName="PageTitle"); self._title_lbl.setWordWrap(True)
         ic.addWidget(self._title_lbl)
         self._ep_count = QLabel("", objectName="SubLbl"); ic.addWidget(self._ep_count)
-        ic.addStretch(); hero.addLayout(ic, 1); root.addLayout(hero)
+        ic.addStretch()
+        self._range_box = QComboBox(objectName="RangeBox"); self._range_box.hide()
+        self._range_box.currentIndexChanged.connect(self._show_range)
+        ic.addWidget(self._range_box, 0, Qt.AlignLeft)
+        hero.addLayout(ic, 1); root.addLayout(hero)
         root.addWidget(_divider())
         self._spin = Spinner("Chargement des épisodes"); self._spin.hide(); root.addWidget(self._spin)
-        gw = QWidget(); gw.setAutoFillBackground(False)
-        self._grid_vbox = QVBoxLayout(gw); self._grid_vbox.setContentsMargins(0,4,0,4)
-        self._grid_vbox.setSpacing(8); self._grid_vbox.setAlignment(Qt.AlignTop)
-        root.addWidget(_scroll_area(gw))
+        self._model = EpisodeModel(self); self._delegate = EpisodeDelegate(self)
+        self._grid = QListView()
+        self._grid.setModel(self._model); self._grid.setItemDelegate(self._delegate)
+        self._grid.setViewMode(QListView.IconMode); self._grid.setMovement(QListView.Static)
+        self._grid.setResizeMode(QListView.Adjust); self._grid.setUniformItemSizes(True)
+        self._grid.setGridSize(QSize(EpisodeDelegate.W + EpisodeDelegate.GAP,
+                                     EpisodeDelegate.H + EpisodeDelegate.GAP))
+        self._grid.setSelectionMode(QAbstractItemView.NoSelection)
+        self._grid.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self._grid.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self._grid.setFrameShape(QFrame.NoFrame); self._grid.viewport().setAutoFillBackground(False)
+        self._grid.setMouseTracking(True); self._grid.setCursor(Qt.PointingHandCursor)
+        self._grid.setFocusPolicy(Qt.NoFocus)
+        self._grid.clicked.connect(lambda ix: self._select_ep(ix.data()))
+        root.addWidget(self._grid, 1)
         action = QHBoxLayout(); action.addStretch()
         self._sel_lbl = QLabel("Aucun épisode sélectionné", objectName="SubLbl"); action.addWidget(self._sel_lbl)
         action.addSpacing(16)
         self._watch_btn = QPushButton("▶  Regarder", objectName="PrimaryBtn")
         self._watch_btn.setFixedHeight(46); self._watch_btn.setEnabled(False)
         self._watch_btn.clicked.connect(self._play)
+        self._binge_btn = QPushButton("⏭  Enchaîner", objectName="GhostBtn", checkable=True)
+        self._binge_btn.setToolTip("Préparer les épisodes suivants et les lire à la suite")
+        self._binge_btn.setChecked(store.get_setting("binge", True))
+        self._binge_btn.toggled.connect(lambda on: store.set_setting(binge=on))
+        action.addWidget(self._binge_btn); action.addSpacing(8)
         action.addWidget(self._watch_btn); root.addLayout(action)
 
     def load(self, anime):
-        self._anime = anime; self._ep = None; self._ep_btns = []
+        self._anime = anime; self._ep = None; self._eps = []
         self._title_lbl.setText(anime["title"]); self._ep_count.setText("Chargement…")
         self._watch_btn.setEnabled(False); self._sel_lbl.setText("Aucun épisode sélectionné")
         set_liked(self._like_btn, store.is_liked(anime["id"]))
-        self._cover.reload(anime); self._clear_grid(); self._spin.start()
-        self._worker = EpisodeWorker(self.api, anime["id"])
-        self._worker.results_ready.connect(self._on_episodes)
-        self._worker.error.connect(self._on_error); self._worker.start()
+        self._cover.reload(anime); self._set_episodes([])
+        hit = self.api.cached_episodes(anime["id"])
+        if hit:
+            self._on_episodes(hit[0])
+            if hit[1]: return
+        else:
+            self._spin.start()
+        # Workers stay referenced until they finish: load() may run again meanwhile
+        w = EpisodeWorker(self.api, anime["id"]); self._workers.add(w)
+        w.results_ready.connect(lambda eps, sid=anime["id"], r=bool(hit): self._on_fetched(sid, eps, r))
+        w.error.connect(lambda msg, sid=anime["id"]: self._anime and self._anime["id"] == sid
+                        and self._on_error(msg))
+        w.finished.connect(lambda w=w: self._workers.discard(w)); w.start()
+
+    def _on_fetched(self, show_id, eps, refresh):
+        if not self._anime or self._anime["id"] != show_id: return   # user moved on
+        if refresh and eps == self._eps: return
+        self._on_episodes(eps)
+        if self._ep is not None and self._model.range_of(self._ep) is None:
+            self._ep = None; self._watch_btn.setEnabled(False)
+            self._sel_lbl.setText("Aucun épisode sélectionné")
 
     def _toggle_like(self):
         if self._anime: set_liked(self._like_btn, store.toggle_like(self._anime))
 
+    @tracing.timed("page.episodes.render")
     def _on_episodes(self, eps):
         self._spin.stop(); cnt = len(eps)
         self._ep_count.setText(f"{cnt} épisode{'s' if cnt != 1 else ''}")
-        COLS = 9; row_lay = None
-        for i, ep in enumerate(eps):
-            if i % COLS == 0:
-                row_lay = QHBoxLayout(); row_lay.setSpacing(6); row_lay.setAlignment(Qt.AlignLeft)
-                self._grid_vbox.addLayout(row_lay)
-            btn = QPushButton(ep, objectName="EpBtn")
-            btn.setFixedSize(66, 36); btn.setCheckable(True); btn.setCursor(Qt.PointingHandCursor)
-            btn.clicked.connect(lambda _, e=ep, b=btn: self._select_ep(e, b))
-            self._ep_btns.append(btn); row_lay.addWidget(btn)
-        if row_lay and cnt % COLS != 0: row_lay.addStretch()
-        self._grid_vbox.addStretch()
+        self._set_episodes(eps)
+
+    def _set_episodes(self, eps):
+        self._eps = eps; self._model.set_episodes(eps); self._model.selected = self._ep
+        self._range_box.blockSignals(True); self._range_box.clear()
+        for lo in range(0, len(eps), self.RANGE):
+            hi = min(lo + self.RANGE, len(eps))
+            self._range_box.addItem(f"{eps[lo]} – {eps[hi - 1]}", (lo, hi))
+        self._range_box.blockSignals(False)
+        self._range_box.setVisible(len(eps) > self.RANGE)
+        pos = self._model.range_of(self._ep)
+        self._range_box.setCurrentIndex(pos // self.RANGE if pos is not None else 0)
+        self._show_range(self._range_box.currentIndex())
+
+    def _show_range(self, i):
+        lo, hi = self._range_box.itemData(i) if i >= 0 else (0, 0)
+        self._model.set_range(lo, hi); self._grid.scrollToTop()
 
     def _on_error(self, msg): self._spin.stop(); self._ep_count.setText(f"Erreur : {msg}")
 
-    def _clear_grid(self):
-        while self._grid_vbox.count():
-            item = self._grid_vbox.takeAt(0)
-            w = item.widget()
-            if w: w.deleteLater()
-            else:
-                sub = item.layout()
-                if sub:
-                    while sub.count():
-                        si = sub.takeAt(0)
-                        if si.widget(): si.widget().deleteLater()
-
-    def _select_ep(self, ep, btn):
-        self._ep = ep
-        for b in self._ep_btns:
-            if b is not btn: b.setChecked(False)
-        btn.setChecked(True); self._sel_lbl.setText(f"Épisode {ep} sélectionné")
+    def _select_ep(self, ep):
+        self._ep = ep; self._model.select(ep)
+        self._sel_lbl.setText(f"Épisode {ep} sélectionné")
         self._watch_btn.setEnabled(True)
 
+    def set_theme(self, key): self._delegate.set_theme(key); self._grid.viewport().update()
+
     def _play(self):
         if not self._anime or not self._ep: return
-        cmd = ["ani-cli"]
-        if self._get_mode() == "dub": cmd.append("--dub")
-        cmd += ["-S", "1", "-e", str(self._ep), self._anime["title"]]
-        store.add_history(self._anime, self._ep); self.played.emit(self._anime, self._ep)
-        subprocess.Popen(cmd, start_new_session=True)
+        self._watch_btn.setEnabled(False); self._watch_btn.setText("Chargement…")
+        self._player.play(self._anime, self._ep, self._get_mode(), self._eps)
+
+    def _reset_watch_btn(self):
+        self._watch_btn.setText("▶  Regarder"); self._watch_btn.setEnabled(bool(self._ep))
+
+    def _on_started(self, anime, ep):
+        self._reset_watch_btn()
+        pos = self._model.range_of(ep) if self._anime and self._anime["id"] == anime["id"] else None
+        if pos is None: return
+        if self._range_box.count() and self._range_box.currentIndex() != pos // self.RANGE:
+            self._range_box.setCurrentIndex(pos // self.RANGE)
+        self._select_ep(ep)                           # follow the binge
+
+    def _on_play_error(self, msg):
+        self._reset_watch_btn(); self._sel_lbl.setText(f"Lecture impossible : {msg}")
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -761,37 +1254,61 @@ class EpisodePage(QWidget):
 
 class LibraryPage(QWidget):
     anime_selected = Signal(dict)
+    anime_hovered  = Signal(dict)
 
-    def __init__(self):
-        super().__init__(); self._build()
+    def __init__(self, get_aio=None):
+        # get_aio() -> (AsyncBridge, AsyncAniCliAPI), built on first "Actualiser"
+        super().__init__(); self._get_aio = get_aio; self._build()
 
     def _build(self):
         root = QVBoxLayout(self); root.setContentsMargins(36,32,36,0); root.setSpacing(14)
         root.addWidget(QLabel("COLLECTION", objectName="SectionLbl"))
-        root.addWidget(QLabel("Mes Animés", objectName="PageTitle"))
+        head = QHBoxLayout()
+        head.addWidget(QLabel("Mes Animés", objectName="PageTitle")); head.addStretch()
+        self._refresh_btn = QPushButton("↻  Actualiser", objectName="GhostBtn")
+        self._refresh_btn.setToolTip("Mettre à jour le nombre d'épisodes de tous les favoris")
+        self._refresh_btn.clicked.connect(self._update_all)
+        self._refresh_btn.setVisible(self._get_aio is not None)
+        head.addWidget(self._refresh_btn); root.addLayout(head)
+        self._filter = QLineEdit(objectName="Search", placeholderText="Filtrer mes animés…")
+        self._filter.textChanged.connect(lambda _: self.refresh()); root.addWidget(self._filter)
         root.addWidget(_divider())
         self._hint = QLabel("Aucun favori.\nClique sur ♥ dans les résultats.",
                             objectName="Hint", alignment=Qt.AlignCenter); root.addWidget(self._hint)
-        self._cont = QWidget()
-        self._vbox = QVBoxLayout(self._cont); self._vbox.setContentsMargins(0,0,0,16)
-        self._vbox.setSpacing(6); self._vbox.addStretch()
-        self._scroll = _scroll_area(self._cont); self._scroll.hide(); root.addWidget(self._scroll)
+        self._scroll = ResultsView(); self._scroll.hide(); root.addWidget(self._scroll, 1)
+        self._scroll.anime_clicked.connect(self.anime_selected)
+        self._scroll.anime_hovered.connect(self.anime_hovered)
+        self._scroll.like_toggled.connect(lambda *_: self.refresh())
+
+    def set_theme(self, key): self._scroll.set_theme(key)
 
+    @tracing.timed("page.library.render")
     def refresh(self):
-        while self._vbox.count():
-            it = self._vbox.takeAt(0)
-            if it.widget(): it.widget().deleteLater()
-        self._vbox.addStretch()
         likes = store.get_likes()
+        self._filter.setVisible(bool(likes))
+        q = self._filter.text().strip()
+        if likes and q:
+            by_id = {a["id"]: a for a in likes}
+            likes = [by_id[a["id"]] for a in index.search(q, len(by_id), by_id.keys())]
+            self._hint.setText("Aucun favori ne correspond.")
+        else:
+            self._hint.setText("Aucun favori.\nClique sur ♥ dans les résultats.")
+        self._scroll.model().set_results(likes)
         if not likes: self._hint.show(); self._scroll.hide(); return
         self._hint.hide(); self._scroll.show()
-        self._vbox.takeAt(self._vbox.count() - 1)
-        for a in likes:
-            card = AnimeCard(a)
-            card.clicked.connect(self.anime_selected)
-            card.like_toggled.connect(lambda *_: self.refresh())
-            self._vbox.addWidget(card)
-        self._vbox.addStretch()
+
+    def _update_all(self):
+        likes = store.get_likes()
+        if not likes: return
+        self._refresh_btn.setEnabled(False)
+        bridge, aio_api = self._get_aio()
+        bridge.submit(aio_api.get_episodes_many([a["id"] for a in likes]), self._on_updated)
+
+    def _on_updated(self, result):
+        self._refresh_btn.setEnabled(True)
+        if not isinstance(result, dict): return
+        store.update_likes({i: {"episodes": len(eps)} for i, eps in result.items() if eps})
+        self.refresh()
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -868,16 +1385,25 @@ class ProfilePage(QWidget):
         root.addWidget(QLabel("APPARENCE", objectName="SectionLbl"))
         self._tiles_layout = QGridLayout(); self._tiles_layout.setSpacing(10)
         root.addLayout(self._tiles_layout)
-        self._rebuild_tiles()
+        self._build_tiles()
 
         # ── Mes Favoris ─────────────────────────────────────────────────────
         root.addWidget(_divider())
         root.addWidget(QLabel("MES FAVORIS", objectName="SectionLbl"))
         self._fav_hint = QLabel("Aucun favori.", objectName="Hint", alignment=Qt.AlignCenter)
         root.addWidget(self._fav_hint)
-        self._fav_grid_w = QWidget(); self._fav_grid_w.setAutoFillBackground(False)
-        self._fav_grid   = QGridLayout(self._fav_grid_w); self._fav_grid.setSpacing(10)
-        root.addWidget(self._fav_grid_w); self._fav_grid_w.hide()
+        self._favs = FavoritesView(); self._favs.hide(); root.addWidget(self._favs)
+        self._favs.anime_clicked.connect(self.anime_selected)
+        self._favs.like_toggled.connect(lambda *_: self.refresh())
+
+        # ── Stockage ────────────────────────────────────────────────────────
+        root.addWidget(_divider())
+        root.addWidget(QLabel("STOCKAGE", objectName="SectionLbl"))
+        sr = QHBoxLayout(); sr.setSpacing(12)
+        self._cache_lbl = QLabel("", objectName="SubLbl"); sr.addWidget(self._cache_lbl, 1)
+        clear_btn = QPushButton("Vider le cache", objectName="GhostBtn")
+        clear_btn.clicked.connect(self._clear_cache); sr.addWidget(clear_btn)
+        root.addLayout(sr)
         root.addStretch()
 
     # ── Name editing ────────────────────────────────────────────────────────
@@ -901,11 +1427,7 @@ class ProfilePage(QWidget):
 
     # ── Themes ──────────────────────────────────────────────────────────────
 
-    def _rebuild_tiles(self):
-        while self._tiles_layout.count():
-            it = self._tiles_layout.takeAt(0)
-            if it.widget(): it.widget().deleteLater()
-        self._tile_widgets.clear()
+    def _build_tiles(self):
         for i, (key, t) in enumerate(THEMES.items()):
             tile = ThemeTile(key, t, selected=(key == self._current_theme))
             tile.clicked.connect(self._select_theme)
@@ -913,64 +1435,148 @@ class ProfilePage(QWidget):
             self._tiles_layout.addWidget(tile, i // 3, i % 3)
 
     def _select_theme(self, key):
-        self._current_theme = key; store.set_theme(key)
-        self._avatar.set_theme(key)
-        self._rebuild_tiles(); self.theme_changed.emit(key)
+        store.set_theme(key); self.sync_theme(key); self.theme_changed.emit(key)
 
     def sync_theme(self, key):
-        self._current_theme = key; self._rebuild_tiles()
-        self._avatar.set_theme(key)
+        if key != self._current_theme:
+            old = self._tile_widgets.get(self._current_theme)
+            if old: old.set_selected(False)
+            if key in self._tile_widgets: self._tile_widgets[key].set_selected(True)
+        self._current_theme = key; self._avatar.set_theme(key); self._favs.set_theme(key)
+
+    # ── Storage ─────────────────────────────────────────────────────────────
+
+    def _update_cache_lbl(self):
+        u = covers.disk().usage()
+        self._cache_lbl.setText(
+            f"Affiches : {u['entries']} fichiers · {u['bytes'] / 2**20:.1f} / {u['limit'] / 2**20:.0f} Mo"
+            f" · succès {u['hit_ratio'] * 100:.0f} %")
+
+    def _clear_cache(self):
+        covers.disk().clear(); QPixmapCache.clear(); self._update_cache_lbl()
 
     # ── Refresh ─────────────────────────────────────────────────────────────
 
+    @tracing.timed("page.profile.render")
     def refresh(self):
+        self._update_cache_lbl()
         profile = store.get_profile()
         name = profile.get("name", "Ismael")
         self._name_lbl.setText(name)
         self._avatar.set_initial(name)
         likes = store.get_likes()
         self._fav_num.setText(str(len(likes)))
-        while self._fav_grid.count():
-            it = self._fav_grid.takeAt(0)
-            if it.widget(): it.widget().deleteLater()
-        if not likes: self._fav_hint.show(); self._fav_grid_w.hide(); return
-        self._fav_hint.hide(); self._fav_grid_w.show()
-        for i, a in enumerate(likes):
-            card = ProfileFavoriteCard(a)
-            card.clicked.connect(self.anime_selected); card.like_toggled.connect(self.refresh)
-            self._fav_grid.addWidget(card, i // 2, i % 2)
+        self._favs.model().set_results(likes)
+        if not likes: self._fav_hint.show(); self._favs.hide(); return
+        self._fav_hint.hide(); self._favs.show()
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 #  MainWindow
 # ─────────────────────────────────────────────────────────────────────────────
 
+class TraceOverlay(QLabel):
+    """F12: p50/p95 per span name (ANISKO_PROFILE=1), refreshed every second."""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setTextFormat(Qt.PlainText); self.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+        self.setStyleSheet("background:rgba(0,0,0,190); color:#e0e0f0; padding:10px;"
+                           "font-family:monospace; font-size:11px; border-radius:8px;")
+        self._timer = QTimer(self); self._timer.setInterval(1000); self._timer.timeout.connect(self._update)
+        self.hide()
+
+    def toggle(self):
+        self.setVisible(not self.isVisible())
+        if self.isVisible(): self._update(); self._timer.start(); self.raise_()
+        else: self._timer.stop()
+
+    def _update(self):
+        if not tracing.ENABLED:
+            self.setText("Traces désactivées — relancer avec ANISKO_PROFILE=1")
+        else:
+            rows = [f"{'span':<24}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}"]
+            rows += [f"{k[:23]:<24}{v['n']:>6}{v['p50']:>10}{v['p95']:>10}{v['max']:>10}"
+                     for k, v in tracing.stats().items()]
+            self.setText("\n".join(rows + ["", str(tracing.path())]))
+        self.adjustSize(); self.move(self.parentWidget().width() - self.width() - 16, 16)
+
+
 class MainWindow(QMainWindow):
+    PREFETCH_HISTORY = 5
+    first_paint = Signal()
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Anisko"); self.setMinimumSize(880, 640); self.resize(1020, 720)
         self.api = AniCliAPI(mode="sub"); self._mode = "sub"; self._theme = store.get_theme()
+        self.aio_api = None; self.bridge = None          # see _aio()
+        self.prefetcher = Prefetcher(self.api)
+        self.player     = player.Player(self)
+        self.player.started.connect(self._on_played)
+        covers.disk()                                   # start indexing the cover cache now
+        threading.Thread(target=index.warm, name="anisko-index", daemon=True).start()
+        self._pages = {}; self._painted = False
         self._build(); self._apply_theme(self._theme); self._nav("search")
+        self._trace = TraceOverlay(self.centralWidget())
+        QShortcut(QKeySequence(Qt.Key_F12), self, self._trace.toggle)
+        # Shows watched recently are the most likely to be reopened
+        QTimer.singleShot(1500, lambda: self.prefetcher.hint_many(store.get_history()[:self.PREFETCH_HISTORY]))
+
+    def eventFilter(self, obj, ev):
+        # Root is opaque and covers the window, so its first paint is the window's
+        if ev.type() == QEvent.Paint and not self._painted:
+            self._painted = True; obj.removeEventFilter(self); self.first_paint.emit()
+        return False
 
     def _build(self):
-        root = QWidget(objectName="Root"); self.setCentralWidget(root)
+        root = QWidget(objectName="Root", autoFillBackground=True); self.setCentralWidget(root)
+        root.installEventFilter(self)
         hbox = QHBoxLayout(root); hbox.setContentsMargins(0,0,0,0); hbox.setSpacing(0)
-        hbox.addWidget(self._make_sidebar())
+        self._sidebar = self._make_sidebar(); hbox.addWidget(self._sidebar)
         content = QWidget(objectName="Content"); self._stack = QStackedWidget()
         cl = QVBoxLayout(content); cl.setContentsMargins(0,0,0,0); cl.addWidget(self._stack)
         hbox.addWidget(content, 1)
-        self._search_page  = SearchPage(self.api)
-        self._episode_page = EpisodePage(self.api, get_mode=lambda: self._mode)
-        self._library_page = LibraryPage()
-        self._profile_page = ProfilePage()
-        self._search_page.anime_selected.connect(self._open_anime)
-        self._episode_page.back.connect(lambda: self._nav("search"))
-        self._episode_page.played.connect(self._on_played)
-        self._library_page.anime_selected.connect(self._open_anime)
-        self._profile_page.anime_selected.connect(self._open_anime)
-        self._profile_page.theme_changed.connect(self._apply_theme)
-        for p in [self._search_page, self._episode_page, self._library_page, self._profile_page]:
-            self._stack.addWidget(p)
+
+    # ── Pages, built on first visit ─────────────────────────────────────────
+
+    def _page(self, key):
+        page = self._pages.get(key)
+        if page is None:
+            page = self._pages[key] = getattr(self, f"_make_{key}_page")()
+            self._stack.addWidget(page)
+        return page
+
+    def _make_search_page(self):
+        page = SearchPage(self.api)
+        page.anime_selected.connect(self._open_anime)
+        page.anime_hovered.connect(lambda a: self.prefetcher.hint(a, urgent=True))
+        page.top_results.connect(self.prefetcher.hint_many)
+        return page
+
+    def _make_episode_page(self):
+        page = EpisodePage(self.api, get_mode=lambda: self._mode, player=self.player)
+        page.back.connect(lambda: self._nav("search"))
+        return page
+
+    def _make_library_page(self):
+        page = LibraryPage(self._aio if HAS_AIO else None)
+        page.anime_selected.connect(self._open_anime)
+        page.anime_hovered.connect(lambda a: self.prefetcher.hint(a, urgent=True))
+        return page
+
+    def _make_profile_page(self):
+        page = ProfilePage()
+        page.anime_selected.connect(self._open_anime)
+        page.theme_changed.connect(self._apply_theme)
+        return page
+
+    def _aio(self):
+        if self.bridge is None:
+            import aio                                  # aiohttp + asyncio: ~200 ms, only when needed
+            self.aio_api = aio.AsyncAniCliAPI(mode=self._mode); self.bridge = AsyncBridge(self)
+        return self.bridge, self.aio_api
 
     def _make_sidebar(self):
         sb = QWidget(objectName="Sidebar"); sb.setFixedWidth(210)
@@ -980,7 +1586,7 @@ class MainWindow(QMainWindow):
         lay.addSpacing(24)
         self._nav_btns = {}
         for key, label in [("search","Rechercher"),("library","Ma Bibliothèque"),("profile","Mon Profil")]:
-            btn = QPushButton(label, objectName="NavBtn")
+            btn = QPushButton(label, objectName="NavBtn", checkable=True)
             btn.clicked.connect(lambda _, k=key: self._nav(k))
             lay.addWidget(btn); self._nav_btns[key] = btn
         lay.addSpacing(16)
@@ -996,34 +1602,90 @@ class MainWindow(QMainWindow):
         sl.addWidget(self._status); lay.addWidget(sw)
         return sb
 
-    def _set_mode(self, text): self._mode = text.lower(); self.api.mode = self._mode
+    def _set_mode(self, text):
+        self._mode = text.lower(); self.api.mode = self._mode
+        if self.aio_api: self.aio_api.mode = self._mode
+
+    def shutdown(self):
+        self.player.shutdown()
+        if self.bridge:
+            try:    self.bridge.stop(self.aio_api.close())
+            except Exception as e: print(f"[aio] close error: {e}")    # the rest must still run
+        net.close(); store.flush()
+
+    # The stylesheet is set on the sidebar and on each page, not on the window:
+    # a theme switch restyles the sidebar and the page on screen, and every other
+    # page is restyled when it is next shown (see _style). Root's background is
+    # its palette, so setting it doesn't cascade into the pages.
 
     def _apply_theme(self, key):
-        self._theme = key; self.setStyleSheet(make_stylesheet(key))
-        self._profile_page.sync_theme(key)
+        with tracing.span("theme.apply", theme=key):
+            self._theme = key; sheet = make_stylesheet(key)
+            pal = self.centralWidget().palette()
+            pal.setColor(QPalette.Window, QColor(THEMES.get(key, THEMES["royal_indigo"])["bg"]))
+            self.centralWidget().setPalette(pal)
+            self._sidebar.setStyleSheet(sheet)
+            pages = self._pages                          # pages built later pick the theme up themselves
+            if "profile" in pages: pages["profile"].sync_theme(key)
+            for k in ("search", "episode", "library"):
+                if k in pages: pages[k].set_theme(key)
+            if self._stack.currentWidget(): self._style(self._stack.currentWidget())
+
+    def _style(self, page):
+        sheet = make_stylesheet(self._theme)
+        if page.styleSheet() != sheet: page.setStyleSheet(sheet)
 
     def _nav(self, key):
-        for k, btn in self._nav_btns.items():
-            btn.setProperty("active", k == key)
-            btn.style().unpolish(btn); btn.style().polish(btn)
-        pages = {"search":self._search_page,"episode":self._episode_page,
-                 "library":self._library_page,"profile":self._profile_page}
-        if key == "library": self._library_page.refresh()
-        if key == "profile": self._profile_page.refresh()
-        self._stack.setCurrentWidget(pages.get(key, self._search_page))
+        for k, btn in self._nav_btns.items(): btn.setChecked(k == key)
+        if key not in ("search", "episode", "library", "profile"): key = "search"
+        page = self._page(key)
+        if key in ("library", "profile"): page.refresh()
+        self._style(page); self._stack.setCurrentWidget(page)
 
     def _open_anime(self, anime):
-        self._nav("episode"); self._episode_page.load(anime)
+        self._nav("episode"); self._page("episode").load(anime)
 
     def _on_played(self, anime, ep):
+        store.add_history(anime, ep); index.add([anime])    # each episode, as it starts
         self._status.setText(f"▶ {anime['title'][:20]}… ep.{ep}")
         QTimer.singleShot(5000, lambda: self._status.setText(""))
-        self._profile_page.refresh()
+        if "profile" in self._pages: self._pages["profile"].refresh()
+
+
+
+
+# ── Startup measurement ────────────────────────────────────────────────────
+
+def _since_exec():
+    # Seconds since the process was exec'd, interpreter start-up included (Linux only)
+    try:
+        ticks = int(open("/proc/self/stat").read().rsplit(")", 1)[1].split()[19])
+        return float(open("/proc/uptime").read().split()[0]) - ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _report_startup(t_imports, t_window):
+    t_paint = time.perf_counter(); exec_s = _since_exec()
+    ms = lambda a, b: f"{(b - a) * 1000:7.1f} ms"
+    print(f"imports        {ms(_T0, t_imports)}\n"
+          f"fenêtre        {ms(t_imports, t_window)}\n"
+          f"première image {ms(t_window, t_paint)}\n"
+          f"total          {ms(_T0, t_paint)}"
+          + (f"\ndepuis exec    {exec_s * 1000:7.0f} ms" if exec_s is not None else ""), flush=True)
+    QApplication.quit()
 
 
 if __name__ == "__main__":
+    t_imports = time.perf_counter()
+    measure = "--measure-startup" in sys.argv
+    if measure: sys.argv.remove("--measure-startup")
     app = QApplication(sys.argv)
     app.setApplicationName("Anisko")
+    QPixmapCache.setCacheLimit(COVER_CACHE_KB)
     font = QFont("Inter"); font.setPointSize(10); app.setFont(font)
-    win = MainWindow(); win.show()
+    win = MainWindow(); t_window = time.perf_counter()
+    if measure: win.first_paint.connect(lambda: QTimer.singleShot(0, lambda: _report_startup(t_imports, t_window)))
+    win.show()
+    app.aboutToQuit.connect(win.shutdown)
     sys.exit(app.exec())
@@ -0,0 +1,116 @@
+import threading
+
+AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/121.0"
+
+POOL_HOSTS   = 4     # distinct hosts kept in the pool (API, CDN…)
+POOL_PER_HOST= 8     # keep-alive connections per host
+RETRIES      = 3
+BACKOFF      = 0.3   # 0.3s, 0.6s, 1.2s…
+TIMEOUT      = 10
+
+_lock    = threading.Lock()
+_session = None
+_stats   = {"requests": 0, "errors": 0, "bytes": 0}
+
+
+def session():
+    """Process-wide keep-alive session, shared by the API and the cover downloads."""
+    global _session
+    with _lock:
+        if _session is None:
+            import requests                      # ~80 ms: paid on first request, off the UI thread
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            retry = Retry(total=RETRIES, connect=RETRIES, read=RETRIES,
+                          backoff_factor=BACKOFF,
+                          status_forcelist=(500, 502, 503, 504),
+                          allowed_methods=frozenset(["GET", "HEAD"]),
+                          raise_on_status=False)
+            adapter = HTTPAdapter(pool_connections=POOL_HOSTS,
+                                  pool_maxsize=POOL_PER_HOST, max_retries=retry)
+            s = requests.Session()
+            s.headers["User-Agent"] = AGENT
+            s.mount("https://", adapter); s.mount("http://", adapter)
+            _session = s
+        return _session
+
+
+def _count(key, n=1):
+    with _lock: _stats[key] += n
+
+
+def get(url, **kw):
+    kw.setdefault("timeout", TIMEOUT)
+    try:
+        r = session().get(url, **kw)
+    except Exception:
+        _count("errors"); raise
+    _count("requests")
+    if not kw.get("stream"): _count("bytes", len(r.content))    # streamed bodies: see count_bytes
+    return r
+
+
+def count_bytes(n):
+    """For get(..., stream=True) callers: add the body bytes actually read to stats()."""
+    _count("bytes", n)
+
+
+def stats() -> dict:
+    """Request counters plus, per pooled host, connections opened vs requests served."""
+    with _lock:
+        out = dict(_stats)
+        s = _session
+    pools = {}
+    if s:
+        for prefix in ("https://", "http://"):
+            pm = s.get_adapter(prefix).poolmanager
+            for key in list(pm.pools.keys()):
+                pool = pm.pools.get(key)
+                if pool is None: continue
+                pools[f"{pool.scheme}://{pool.host}"] = {
+                    "connections": pool.num_connections,
+                    "requests":    pool.num_requests,
+                    "idle":        pool.pool.qsize() if pool.pool else 0,
+                }
+    out["pools"] = pools
+    return out
+
+
+class SingleFlight:
+    """Coalesces concurrent identical calls: while `key` is in flight, callers wait for
+    the first one and share its result (or exception) instead of starting their own."""
+
+    def __init__(self):
+        self._lock  = threading.Lock()
+        self._calls = {}             # key -> [Event, result, error]
+        self.hits = 0; self.misses = 0
+
+    def do(self, key, fn, *args, **kw):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = [threading.Event(), None, None]; self.misses += 1
+                leader = True
+            else:
+                self.hits += 1; leader = False
+        if not leader:
+            call[0].wait()
+            if call[2] is not None: raise call[2]
+            return call[1]
+        try:
+            call[1] = fn(*args, **kw); return call[1]
+        except Exception as e:
+            call[2] = e; raise
+        finally:
+            with self._lock: self._calls.pop(key, None)
+            call[0].set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "in_flight": len(self._calls)}
+
+
+def close():
+    global _session
+    with _lock:
+        if _session is not None: _session.close(); _session = None
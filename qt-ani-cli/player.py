@@ -0,0 +1,336 @@
+import itertools
+import json
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from PySide6.QtCore import QObject, Signal
+import net
+import store
+import tracing
+from api import API_URL, REFERER
+
+# Resolves an episode to a playable stream straight from the show id, the way
+# ani-cli does it, then hands it to mpv. ani-cli stays as the fallback.
+
+STREAM_GQL = '''query($showId:String! $translationType:VaildTranslationTypeEnumType! $episodeString:String!){
+    episode(showId:$showId translationType:$translationType episodeString:$episodeString){
+        episodeString sourceUrls
+    }
+}'''
+
+CLOCK_HOST = "https://allanime.day"
+STREAM_TTL = 10 * 60     # resolved URLs are signed and expire; reuse them this long
+BINGE_AHEAD= 2           # episodes resolved and queued in mpv ahead of the current one
+
+
+def decode_source(url: str):
+    """AllAnime hides provider paths as "--" + hex, each byte XOR 56."""
+    if not url or not url.startswith("--"): return None
+    try:    raw = bytes(b ^ 56 for b in bytes.fromhex(url[2:])).decode()
+    except ValueError: return None
+    return raw.replace("/clock", "/clock.json", 1)
+
+
+def source_urls(show_id, mode, ep) -> list:
+    """Provider paths for one episode, best priority first."""
+    r = net.get(API_URL, headers={"Referer": REFERER},
+                params={"variables": json.dumps({"showId": show_id, "translationType": mode,
+                                                 "episodeString": str(ep)}),
+                        "query": STREAM_GQL})
+    r.raise_for_status()
+    srcs = ((r.json().get("data") or {}).get("episode") or {}).get("sourceUrls") or []
+    srcs = sorted(srcs, key=lambda s: -float(s.get("priority") or 0))
+    return [(s.get("sourceName", ""), p) for s in srcs if (p := decode_source(s.get("sourceUrl")))]
+
+
+def _quality(res: str) -> int:
+    digits = "".join(c for c in (res or "") if c.isdigit())
+    return int(digits) if digits else 0
+
+
+def _wixmp(link):
+    # repackager.wixmp.com/…/,1080p,720p,/mp4/file.mp4.urlset/master.m3u8 → one mp4 per quality
+    base = link.replace("repackager.wixmp.com/", "").split(".urlset")[0]
+    head, _, rest = base.partition("/,"); sizes, _, tail = rest.partition(",/")
+    return [(_quality(q), f"{head}/{q}/{tail}") for q in sizes.split(",") if q]
+
+
+def links(path) -> list:
+    """[(quality, url, referer)] served by one provider path, best quality first."""
+    if path.startswith("http"):
+        return [(0, path, REFERER)]
+    r = net.get(CLOCK_HOST + path, headers={"Referer": REFERER})
+    r.raise_for_status()
+    out = []
+    for l in r.json().get("links") or []:
+        url = l.get("link") or l.get("src")
+        if not url: continue
+        ref = (l.get("headers") or {}).get("Referer") or REFERER
+        if "repackager.wixmp.com" in url: out += [(q, u, ref) for q, u in _wixmp(url)]
+        else: out.append((_quality(l.get("resolutionStr")), url, ref))
+    return sorted(out, key=lambda x: -x[0])
+
+
+def resolve(show_id, mode, ep):
+    """Best stream for an episode as {"url", "quality", "referer", "source"}, or None."""
+    with tracing.span("player.resolve") as sp:
+        stream = _resolve(show_id, mode, ep)
+        sp.set(source=stream and stream["source"])
+    return stream
+
+
+def _resolve(show_id, mode, ep):
+    for name, path in source_urls(show_id, mode, ep):
+        try:
+            found = links(path)
+        except Exception as e:
+            print(f"[player] {name} error: {e}"); continue
+        if found:
+            q, url, ref = found[0]
+            return {"url": url, "quality": q, "referer": ref, "source": name}
+    return None
+
+
+_streams = {}            # (show_id, mode, ep) -> (time, stream)
+_streams_lock = threading.Lock()
+
+
+def resolve_cached(show_id, mode, ep):
+    key = (show_id, mode, str(ep))
+    with _streams_lock:
+        hit = _streams.get(key)
+        if hit and time.monotonic() - hit[0] < STREAM_TTL: return hit[1]
+    stream = resolve(show_id, mode, ep)
+    if stream:
+        with _streams_lock: _streams[key] = (time.monotonic(), stream)
+    return stream
+
+
+def media_title(anime, ep):
+    return f"{anime['title']} – Épisode {ep}"
+
+
+def has_mpv() -> bool:
+    return shutil.which("mpv") is not None
+
+
+def mpv_cmd(stream, title):
+    return ["mpv", f"--force-media-title={title}",
+            f"--http-header-fields=Referer: {stream['referer']}", stream["url"]]
+
+
+def ani_cli_cmd(anime, ep, mode):
+    cmd = ["ani-cli"]
+    if mode == "dub": cmd.append("--dub")
+    return cmd + ["-S", "1", "-e", str(ep), anime["title"]]
+
+
+def launch_cmd(stream, anime, ep, mode):
+    """mpv on a resolved stream, or ani-cli if there is none (or no mpv)."""
+    if stream and has_mpv(): return mpv_cmd(stream, media_title(anime, ep))
+    return ani_cli_cmd(anime, ep, mode)
+
+
+# ── mpv JSON IPC ───────────────────────────────────────────────────────────
+
+def ipc_supported() -> bool:
+    return hasattr(socket, "AF_UNIX") and has_mpv()
+
+
+def mpv_options(stream, title) -> dict:
+    # Per-file options for loadfile (same as mpv_cmd's, without the URL)
+    return {"force-media-title": title, "http-header-fields": f"Referer: {stream['referer']}"}
+
+
+class MpvIPC:
+    """Line-delimited JSON over mpv's --input-ipc-server socket; events go to on_event(ipc, msg)."""
+
+    def __init__(self, path, on_event, timeout=5.0):
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        deadline = time.monotonic() + timeout
+        while True:                                   # mpv creates the socket shortly after start
+            try:    self._sock.connect(path); break
+            except OSError:
+                if time.monotonic() > deadline: raise
+                time.sleep(0.05)
+        self._on_event = on_event
+        self._ids = itertools.count(1); self._replies = {}; self._lock = threading.Lock()
+        self._send = threading.Lock()                 # one writer at a time: lines must not interleave
+        self.closed = False
+        threading.Thread(target=self._read, name="anisko-mpv-ipc", daemon=True).start()
+
+    def command(self, *args, wait=False, **named):
+        rid = next(self._ids)
+        msg = {"command": dict(named) if named else list(args), "request_id": rid}
+        waiter = threading.Event() if wait else None
+        if waiter:
+            with self._lock: self._replies[rid] = [waiter, None]
+        try:
+            with self._send: self._sock.sendall(json.dumps(msg).encode() + b"\n")
+        except OSError:
+            self.closed = True; return None
+        if not waiter: return None
+        waiter.wait(2.0)
+        with self._lock: return self._replies.pop(rid, [None, None])[1]
+
+    def _read(self):
+        buf = b""
+        while True:
+            try:    data = self._sock.recv(65536)
+            except OSError: data = b""
+            if not data: break
+            buf += data
+            while b"\n" in buf:
+                line, buf = buf.split(b"\n", 1)
+                try:    msg = json.loads(line)
+                except ValueError: continue
+                if "event" in msg: self._on_event(self, msg); continue
+                with self._lock: r = self._replies.get(msg.get("request_id"))
+                if r: r[1] = msg; r[0].set()
+        self.closed = True
+        self._on_event(self, {"event": "closed"})
+
+    def close(self):
+        try: self._sock.close()
+        except OSError: pass
+
+
+class Player(QObject):
+    """One long-lived mpv (--idle) driven over IPC; episodes are swapped in with loadfile.
+
+    In binge mode the next `ahead` episodes are resolved in the background and
+    appended to mpv's playlist, so moving on starts at once. `started` fires as
+    each episode starts (also for the ani-cli fallback, once). The playback
+    position is saved to history so an episode resumes where it was left.
+    """
+    started = Signal(dict, str)      # anime, episode
+    error   = Signal(str)
+    SAVE_EVERY = 10.0                # seconds between position saves while playing
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lock = threading.Lock(); self._gen = 0
+        self._sock = os.path.join(tempfile.gettempdir(), f"anisko-mpv-{os.getpid()}.sock")
+        self._ipc = None; self._procs = []
+        self._anime = None; self._mode = "sub"; self._eps = []; self._playlist = []; self._pos = -1
+        self._time = None; self._duration = None; self._saved = 0.0
+
+    def ahead(self) -> int:
+        return int(store.get_setting("binge_ahead", BINGE_AHEAD)) if store.get_setting("binge", True) else 0
+
+    def play(self, anime, ep, mode, episodes=()):
+        """Start `ep`; `episodes` is the show's full list, to know what comes next."""
+        with self._lock: self._gen += 1; gen = self._gen
+        threading.Thread(target=self._start, args=(gen, anime, str(ep), mode, [str(e) for e in episodes]),
+                         name="anisko-play", daemon=True).start()
+
+    # ── Processes ───────────────────────────────────────────────────────────
+
+    def _spawn(self, cmd):
+        proc = subprocess.Popen(cmd, start_new_session=True)
+        with self._lock: self._procs.append(proc)
+        threading.Thread(target=self._reap, args=(proc,), name="anisko-reap", daemon=True).start()
+        return proc
+
+    def _reap(self, proc):
+        proc.wait()                                   # no zombies left behind
+        with self._lock: self._procs.remove(proc)
+
+    def _connect(self):
+        # The running mpv, or a fresh idle one
+        with self._lock:
+            if self._ipc is not None and not self._ipc.closed: return self._ipc
+        try: os.unlink(self._sock)
+        except OSError: pass
+        self._spawn(["mpv", "--idle=yes", "--force-window=yes", f"--input-ipc-server={self._sock}"])
+        ipc = MpvIPC(self._sock, self._on_event)
+        for i, prop in enumerate(("playlist-pos", "time-pos", "duration"), 1):
+            ipc.command("observe_property", i, prop)
+        with self._lock: self._ipc = ipc
+        return ipc
+
+    # ── Playback ────────────────────────────────────────────────────────────
+
+    def _start(self, gen, anime, ep, mode, episodes):
+        try:    stream = resolve_cached(anime["id"], mode, ep)
+        except Exception as e: print(f"[player] resolve error: {e}"); stream = None
+        if gen != self._gen: return                   # another play() came in meanwhile
+        if stream is None or not ipc_supported():
+            try:    self._spawn(launch_cmd(stream, anime, ep, mode))
+            except OSError as e: self.error.emit(str(e)); return
+            self.started.emit(anime, ep); return
+        try:
+            ipc = self._connect()
+        except OSError as e:
+            self.error.emit(str(e)); return
+        self._save_position()                         # for the episode being replaced
+        opts = mpv_options(stream, media_title(anime, ep))
+        start = store.get_position(anime["id"], ep)
+        if start: opts["start"] = str(int(start))
+        with self._lock:
+            self._anime, self._mode, self._eps = anime, mode, episodes
+            self._playlist = [ep]; self._pos = 0; self._time = self._duration = None
+        ipc.command(name="loadfile", url=stream["url"], flags="replace", options=opts)
+        self.started.emit(anime, ep)
+        self._feed(gen, 0)
+
+    def _feed(self, gen, pos):
+        # Resolve and append until `ahead` episodes are queued after `pos`
+        while True:
+            with self._lock:
+                if gen != self._gen or self._ipc is None or self._ipc.closed: return
+                if len(self._playlist) > pos + self.ahead(): return
+                last = self._playlist[-1]
+                i = self._eps.index(last) + 1 if last in self._eps else len(self._eps)
+                if i >= len(self._eps): return
+                anime, mode, ep, ipc = self._anime, self._mode, self._eps[i], self._ipc
+            try:    stream = resolve_cached(anime["id"], mode, ep)
+            except Exception as e: print(f"[player] resolve error: {e}"); stream = None
+            if stream is None: return
+            with self._lock:
+                if gen != self._gen: return
+                if self._playlist[-1] != last: continue   # another feeder got there first
+                # Sent under the lock, so mpv's playlist is appended in _playlist's order
+                self._playlist.append(ep)
+                ipc.command(name="loadfile", url=stream["url"], flags="append",
+                            options=mpv_options(stream, media_title(anime, ep)))
+
+    def _on_event(self, ipc, msg):
+        if msg.get("event") == "closed":              # user closed mpv: next play starts a new one
+            if ipc is self._ipc:
+                self._save_position()
+                with self._lock: self._ipc = None
+            return
+        if ipc is not self._ipc or msg.get("event") != "property-change": return
+        name, data = msg.get("name"), msg.get("data")
+        if name == "time-pos" and data is not None:
+            self._time = data
+            if time.monotonic() - self._saved > self.SAVE_EVERY: self._save_position()
+        elif name == "duration" and data is not None:
+            self._duration = data
+        elif name == "playlist-pos":
+            with self._lock:
+                if not isinstance(data, int) or data < 0 or data == self._pos or data >= len(self._playlist): return
+            self._save_position()
+            with self._lock:
+                self._pos = data; self._time = self._duration = None
+                anime, ep, gen = self._anime, self._playlist[data], self._gen
+            self.started.emit(anime, ep)
+            threading.Thread(target=self._feed, args=(gen, data), daemon=True).start()
+
+    def _save_position(self):
+        with self._lock:
+            if self._anime is None or not 0 <= self._pos < len(self._playlist) or self._time is None: return
+            anime, ep, t, d = self._anime, self._playlist[self._pos], self._time, self._duration
+        self._saved = time.monotonic()
+        store.set_position(anime["id"], ep, t, d)
+
+    def shutdown(self):
+        """Save where we are and let go of mpv (it keeps playing on its own)."""
+        self._save_position()
+        with self._lock: ipc, self._ipc = self._ipc, None
+        if ipc: ipc.close()
@@ -1,109 +1,398 @@
 import json
+import time
+import atexit
+import sqlite3
+import threading
+import tracing
 from pathlib import Path
 
 DATA_DIR     = Path.home() / ".local" / "share" / "anisko"
+DB_FILE      = DATA_DIR / "anisko.db"
+COVERS_DIR   = DATA_DIR / "covers"
+HISTORY_MAX  = 50
+
+# Pre-SQLite JSON files, imported once then renamed to *.json.bak
 LIKES_FILE   = DATA_DIR / "likes.json"
 HISTORY_FILE = DATA_DIR / "history.json"
 SETTINGS_FILE= DATA_DIR / "settings.json"
 PROFILE_FILE = DATA_DIR / "profile.json"
 
-
-def _ensure():
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    for f in [LIKES_FILE, HISTORY_FILE]:
-        if not f.exists():
-            f.write_text("[]")
-    for f in [SETTINGS_FILE, PROFILE_FILE]:
-        if not f.exists():
-            f.write_text("{}")
-
-
-def get_cover_path(show_id: str) -> Path:
-    d = DATA_DIR / "covers"; d.mkdir(exist_ok=True)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS likes(
+    pos  INTEGER PRIMARY KEY AUTOINCREMENT,
+    id   TEXT NOT NULL UNIQUE,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS history(
+    seq  INTEGER PRIMARY KEY AUTOINCREMENT,
+    id   TEXT NOT NULL UNIQUE,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS shows(
+    id   TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS kv(
+    ns    TEXT NOT NULL,
+    key   TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY(ns, key)
+);
+"""
+SCHEMA_VERSION = 2               # 1: likes/history/kv, 2: + shows (local search index)
+
+_local = threading.local()       # one connection per thread
+_init_lock = threading.Lock()
+
+
+def _db() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(DB_FILE), timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with _init_lock:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < SCHEMA_VERSION:
+                with conn:
+                    conn.executescript(SCHEMA)
+                    if version == 0: _migrate_json(conn)
+                    conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        _local.conn = conn
+    return conn
+
+
+def _read_json(f: Path, default):
+    try:    return json.loads(f.read_text()) or default
+    except: return default
+
+
+def _migrate_json(conn):
+    likes = _read_json(LIKES_FILE, [])
+    conn.executemany("INSERT OR IGNORE INTO likes(id, data) VALUES(?, ?)",
+                     [(a["id"], json.dumps(a, ensure_ascii=False)) for a in likes])
+    hist = _read_json(HISTORY_FILE, [])
+    conn.executemany("INSERT OR IGNORE INTO history(id, data) VALUES(?, ?)",   # oldest first
+                     [(h["id"], json.dumps(h, ensure_ascii=False)) for h in reversed(hist)])
+    for ns, f in (("settings", SETTINGS_FILE), ("profile", PROFILE_FILE)):
+        conn.executemany("INSERT OR REPLACE INTO kv(ns, key, value) VALUES(?, ?, ?)",
+                         [(ns, k, json.dumps(v)) for k, v in _read_json(f, {}).items()])
+    for f in (LIKES_FILE, HISTORY_FILE, SETTINGS_FILE, PROFILE_FILE):
+        if f.exists(): f.replace(f.with_suffix(".json.bak"))
+
+
+_covers_made = False
+
+
+def covers_dir() -> Path:
+    global _covers_made
+    if not _covers_made: COVERS_DIR.mkdir(parents=True, exist_ok=True); _covers_made = True
+    return COVERS_DIR
+
+
+def get_cover_path(show_id: str, size=None) -> Path:
+    # size=(w, h) → pre-scaled thumbnail, None → legacy full-size download
+    d = covers_dir()
     safe = "".join(c for c in show_id if c.isalnum() or c in "-_")
-    return d / f"{safe}.jpg"
+    return d / (f"{safe}_{size[0]}x{size[1]}.jpg" if size else f"{safe}.jpg")
 
 
 def get_avatar_path() -> Path:
-    _ensure()
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
     return DATA_DIR / "avatar.jpg"
 
 
+# ── In-memory state + write-behind ─────────────────────────────────────────
+#
+# Everything is loaded once into _mem; reads never touch SQLite. Writes update
+# _mem immediately and mark what changed; a writer thread flushes the dirty
+# rows DEBOUNCE seconds after the last write, in one transaction. If another
+# process changes the database file, _mem is reloaded (checked every
+# CHECK_EVERY seconds, only when nothing is waiting to be written).
+
+DEBOUNCE    = 0.5
+CHECK_EVERY = 2.0
+
+_lock       = threading.RLock()
+_wake       = threading.Condition(_lock)
+_flush_lock = threading.Lock()
+_mem        = None
+_dirty      = {"likes": {}, "history": False, "kv": set(), "shows": set()}   # likes: id -> "add" | "set"
+_stamp      = None
+_checked    = 0.0
+_due        = 0.0
+_writer     = None
+_flushing   = False      # a batch is taken but not committed yet: the file is behind _mem
+
+
+def _file_stamp():
+    out = []
+    for f in (DB_FILE, DB_FILE.with_name(DB_FILE.name + "-wal")):
+        try:    st = f.stat(); out.append((st.st_mtime_ns, st.st_size))
+        except OSError: out.append(None)
+    return tuple(out)
+
+
+def _pending():
+    return bool(_dirty["likes"] or _dirty["history"] or _dirty["kv"] or _dirty["shows"])
+
+
+def _load():
+    with tracing.span("store.load"):
+        return _load_rows()
+
+
+def _load_rows():
+    conn = _db()
+    kv = {"settings": {}, "profile": {}}
+    for ns, k, v in conn.execute("SELECT ns, key, value FROM kv"):
+        kv.setdefault(ns, {})[k] = json.loads(v)
+    return {
+        "likes":   {i: json.loads(d) for i, d in conn.execute("SELECT id, data FROM likes ORDER BY pos")},
+        "history": [json.loads(d) for (d,) in conn.execute("SELECT data FROM history ORDER BY seq DESC")],
+        "kv":      kv,
+        "shows":   {i: json.loads(d) for i, d in conn.execute("SELECT id, data FROM shows")},
+    }
+
+
+def _state():
+    global _mem, _stamp, _checked
+    with _lock:
+        now = time.monotonic()
+        if _mem is not None and (now - _checked < CHECK_EVERY or _pending() or _flushing): return _mem
+        _checked = now
+        stamp = _file_stamp()
+        if _mem is None or stamp != _stamp:
+            _mem = _load(); _stamp = _file_stamp()
+        return _mem
+
+
+def _touch(kind, key=None, op="set"):
+    # caller holds _lock
+    global _due, _writer
+    if kind == "history": _dirty["history"] = True
+    elif kind == "kv":    _dirty["kv"].add(key)
+    elif kind == "shows": _dirty["shows"].add(key)
+    elif _dirty["likes"].get(key) != "add": _dirty["likes"][key] = op
+    _due = time.monotonic() + DEBOUNCE
+    if _writer is None:
+        _writer = threading.Thread(target=_write_loop, name="anisko-store", daemon=True)
+        _writer.start()
+    _wake.notify()
+
+
+def _take_dirty():
+    # caller holds _lock: snapshot the rows to write and reset the dirty marks;
+    # the old marks are returned too, to be put back if the write fails
+    likes = [(i, op, json.dumps(_mem["likes"][i], ensure_ascii=False) if i in _mem["likes"] else None)
+             for i, op in _dirty["likes"].items()]
+    hist  = [(h["id"], json.dumps(h, ensure_ascii=False)) for h in reversed(_mem["history"])] \
+            if _dirty["history"] else None
+    kv    = [(ns, k, json.dumps(_mem["kv"][ns][k]) if k in _mem["kv"].get(ns, {}) else None)
+             for ns, k in _dirty["kv"]]
+    shows = [(i, json.dumps(_mem["shows"][i], ensure_ascii=False)) for i in _dirty["shows"]]
+    marks = dict(_dirty)
+    _dirty["likes"] = {}; _dirty["history"] = False; _dirty["kv"] = set(); _dirty["shows"] = set()
+    return (likes, hist, kv, shows), marks
+
+
+def _restore_dirty(marks):
+    # caller holds _lock: a write failed, mark its rows again (rows are re-read from _mem
+    # on the next try) and retry after DEBOUNCE
+    global _due
+    for i, op in marks["likes"].items():
+        if op == "add" or i not in _dirty["likes"]: _dirty["likes"][i] = op     # "add" sticks, as in _touch
+    _dirty["history"] = _dirty["history"] or marks["history"]
+    _dirty["kv"] |= marks["kv"]; _dirty["shows"] |= marks["shows"]
+    _due = time.monotonic() + DEBOUNCE
+    _wake.notify()
+
+
+def _write(likes, hist, kv, shows):
+    with tracing.span("store.write", likes=len(likes), history=hist is not None,
+                      kv=len(kv), shows=len(shows)), _db() as conn:
+        for i, op, data in likes:
+            # "add" re-inserts so a like removed and re-added moves to the end, as in _mem
+            if data is None or op == "add": conn.execute("DELETE FROM likes WHERE id=?", (i,))
+            if data is not None:
+                conn.execute("INSERT INTO likes(id, data) VALUES(?, ?) "
+                             "ON CONFLICT(id) DO UPDATE SET data=excluded.data", (i, data))
+        if hist is not None:
+            conn.execute("DELETE FROM history")
+            conn.executemany("INSERT INTO history(id, data) VALUES(?, ?)", hist)
+        for ns, k, v in kv:
+            if v is None: conn.execute("DELETE FROM kv WHERE ns=? AND key=?", (ns, k))
+            else: conn.execute("INSERT OR REPLACE INTO kv(ns, key, value) VALUES(?, ?, ?)", (ns, k, v))
+        conn.executemany("INSERT OR REPLACE INTO shows(id, data) VALUES(?, ?)", shows)
+
+
+def flush():
+    """Write pending changes now (called on shutdown)."""
+    global _stamp, _flushing
+    with _flush_lock:
+        with _lock:
+            if _mem is None or not _pending(): return
+            batch, marks = _take_dirty(); _flushing = True
+        ok = False
+        try:
+            _write(*batch); ok = True
+        finally:
+            with _lock:
+                _flushing = False
+                if ok: _stamp = _file_stamp()
+                else:  _restore_dirty(marks)
+
+
+def _write_loop():
+    while True:
+        with _lock:
+            while not _pending(): _wake.wait()
+            while (left := _due - time.monotonic()) > 0: _wake.wait(left)
+        try:
+            flush()
+        except Exception as e:
+            print(f"[store] write error: {e}")
+
+
+atexit.register(flush)
+
+
+# ── Key/value namespaces (profile, settings) ───────────────────────────────
+
+def _get_ns(ns) -> dict:
+    return dict(_state()["kv"].get(ns, {}))
+
+
+def _set_ns(ns, **kwargs):
+    with _lock:
+        d = _state()["kv"].setdefault(ns, {})
+        for k, v in kwargs.items(): d[k] = v; _touch("kv", (ns, k))
+
+
 # ── Profile ────────────────────────────────────────────────────────────────
 
 def get_profile() -> dict:
-    _ensure()
-    try:
-        return json.loads(PROFILE_FILE.read_text()) or {}
-    except Exception:
-        return {}
+    return _get_ns("profile")
 
 
 def set_profile(**kwargs):
-    p = get_profile()
-    p.update(kwargs)
-    PROFILE_FILE.write_text(json.dumps(p, indent=2))
+    _set_ns("profile", **kwargs)
 
 
 # ── Likes ──────────────────────────────────────────────────────────────────
 
 def get_likes():
-    _ensure()
-    try:   return json.loads(LIKES_FILE.read_text())
-    except: return []
+    return list(_state()["likes"].values())
 
 
 def is_liked(show_id):
-    return any(a["id"] == show_id for a in get_likes())
+    return show_id in _state()["likes"]
 
 
 def add_like(anime):
-    likes = get_likes()
-    if not any(a["id"] == anime["id"] for a in likes):
-        likes.append(anime)
-        LIKES_FILE.write_text(json.dumps(likes, ensure_ascii=False, indent=2))
+    with _lock:
+        likes = _state()["likes"]
+        if anime["id"] not in likes:
+            likes[anime["id"]] = dict(anime); _touch("likes", anime["id"], "add")
 
 
 def remove_like(show_id):
-    LIKES_FILE.write_text(json.dumps(
-        [a for a in get_likes() if a["id"] != show_id],
-        ensure_ascii=False, indent=2))
+    with _lock:
+        if _state()["likes"].pop(show_id, None) is not None: _touch("likes", show_id)
+
+
+def update_likes(changes: dict):
+    # changes: {show_id: {field: value}}
+    with _lock:
+        likes = _state()["likes"]
+        for show_id, fields in changes.items():
+            if show_id in likes: likes[show_id] = {**likes[show_id], **fields}; _touch("likes", show_id)
 
 
 def toggle_like(anime):
-    if is_liked(anime["id"]): remove_like(anime["id"]); return False
-    else: add_like(anime); return True
+    with _lock:
+        if is_liked(anime["id"]): remove_like(anime["id"]); return False
+        add_like(anime); return True
 
 
 # ── History ────────────────────────────────────────────────────────────────
 
 def add_history(anime, episode):
-    _ensure()
-    try:    hist = json.loads(HISTORY_FILE.read_text())
-    except: hist = []
-    hist = [h for h in hist if h["id"] != anime["id"]]
-    hist.insert(0, {**anime, "last_episode": str(episode)})
-    HISTORY_FILE.write_text(json.dumps(hist[:50], ensure_ascii=False, indent=2))
+    with _lock:
+        st = _state()
+        hist = [h for h in st["history"] if h["id"] != anime["id"]]
+        entry = {k: v for k, v in anime.items() if k not in ("position", "duration")}
+        hist.insert(0, {**entry, "last_episode": str(episode)})
+        st["history"] = hist[:HISTORY_MAX]; _touch("history")
 
 
 def get_history():
-    _ensure()
-    try:    return json.loads(HISTORY_FILE.read_text())
-    except: return []
+    return list(_state()["history"])
+
+
+RESUME_MIN = 15          # seconds: below this, or within the last 5 %, start from the top
+
+
+def set_position(show_id, episode, seconds, duration=None):
+    with _lock:
+        for h in _state()["history"]:
+            if h["id"] == show_id and h.get("last_episode") == str(episode):
+                h["position"] = round(seconds, 1)
+                if duration: h["duration"] = round(duration, 1)
+                _touch("history"); return
+
+
+def get_position(show_id, episode):
+    """Where to resume `episode`, or None."""
+    for h in _state()["history"]:
+        if h["id"] != show_id: continue
+        pos, dur = h.get("position"), h.get("duration")
+        if h.get("last_episode") != str(episode) or not pos or pos < RESUME_MIN: return None
+        if dur and pos > dur * 0.95: return None
+        return pos
+    return None
+
+
+# ── Shows seen (search results, likes, history) ───────────────────────────
+
+SHOW_FIELDS = ("id", "title", "type", "episodes", "thumbnail")
+
+
+def get_shows():
+    return list(_state()["shows"].values())
+
+
+def remember_shows(animes):
+    """Keep the latest title/type/episodes/thumbnail of every show we come across."""
+    changed = []
+    with _lock:
+        shows = _state()["shows"]
+        for a in animes:
+            if not a.get("id"): continue
+            row = {k: a.get(k) for k in SHOW_FIELDS if a.get(k) is not None}
+            if shows.get(a["id"]) != row:
+                shows[a["id"]] = row; _touch("shows", a["id"]); changed.append(row)
+    return changed
 
 
 # ── Settings ───────────────────────────────────────────────────────────────
 
 def _get_settings():
-    _ensure()
-    try:    return json.loads(SETTINGS_FILE.read_text()) or {}
-    except: return {}
+    return _get_ns("settings")
+
+
+def get_setting(key, default=None):
+    return _state()["kv"].get("settings", {}).get(key, default)
+
+
+def set_setting(**kwargs):
+    _set_ns("settings", **kwargs)
 
 
 def get_theme():
-    return _get_settings().get("theme", "royal_indigo")
+    return get_setting("theme", "royal_indigo")
 
 
 def set_theme(key):
-    s = _get_settings(); s["theme"] = key
-    SETTINGS_FILE.write_text(json.dumps(s, indent=2))
+    _set_ns("settings", theme=key)
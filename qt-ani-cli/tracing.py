@@ -0,0 +1,96 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+# Opt-in timing spans: ANISKO_PROFILE=1 ./anisko
+#
+#   with tracing.span("api.query", op="search") as sp:
+#       ...; sp.set(status=200, bytes=1234)
+#
+#   @tracing.timed("page.search.render")
+#   def _render(self, ...): ...
+#
+# Spans are appended to DATA_DIR/trace-<pid>.jsonl and summarised per name
+# (count, p50, p95) for the F12 overlay. Disabled, span() hands back one shared
+# no-op object and timed() returns the function untouched.
+
+ENABLED  = bool(os.environ.get("ANISKO_PROFILE"))
+KEEP     = 1000          # durations kept per span name for the percentiles
+
+_lock    = threading.Lock()
+_samples = defaultdict(lambda: deque(maxlen=KEEP))
+_file    = None
+_t0      = time.time() - time.perf_counter()
+
+
+class _Noop:
+    __slots__ = ()
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+    def set(self, **attrs): pass
+
+
+_NOOP = _Noop()
+
+
+class _Span:
+    __slots__ = ("name", "attrs", "start")
+
+    def __init__(self, name, attrs):
+        self.name = name; self.attrs = attrs
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        self.start = time.perf_counter(); return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None: self.attrs["error"] = exc_type.__name__
+        _record(self.name, self.start, time.perf_counter(), self.attrs)
+        return False
+
+
+def span(name, **attrs):
+    return _Span(name, attrs) if ENABLED else _NOOP
+
+
+def timed(name):
+    def wrap(fn):
+        if not ENABLED: return fn
+        def inner(*args, **kw):
+            with _Span(name, {}): return fn(*args, **kw)
+        inner.__name__ = fn.__name__; inner.__doc__ = fn.__doc__
+        return inner
+    return wrap
+
+
+def path():
+    import store                 # late: store itself is traced
+    return store.DATA_DIR / f"trace-{os.getpid()}.jsonl"
+
+
+def _record(name, start, end, attrs):
+    global _file
+    ms = (end - start) * 1000
+    line = json.dumps({"name": name, "ts": round(_t0 + start, 6), "ms": round(ms, 3),
+                       "thread": threading.current_thread().name, **attrs}, ensure_ascii=False)
+    with _lock:
+        _samples[name].append(ms)
+        if _file is None:
+            p = path(); p.parent.mkdir(parents=True, exist_ok=True)
+            _file = open(p, "a", buffering=1)
+        _file.write(line + "\n")
+
+
+def _pct(sorted_ms, p):
+    return sorted_ms[min(len(sorted_ms) - 1, int(len(sorted_ms) * p))]
+
+
+def stats() -> dict:
+    """{name: {"n", "p50", "p95", "max"}} over the last KEEP spans of each name."""
+    with _lock: snap = {k: sorted(v) for k, v in _samples.items() if v}
+    return {k: {"n": len(v), "p50": round(_pct(v, 0.50), 2), "p95": round(_pct(v, 0.95), 2),
+                "max": round(v[-1], 2)} for k, v in sorted(snap.items())}